@@ -1,26 +1,265 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Match
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, UpdateOne, IndexModel, ASCENDING, DESCENDING, monitoring
+from pymongo.errors import DuplicateKeyError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
 import uuid
 from datetime import datetime, timezone, timedelta
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 import asyncio
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
 import hashlib
+import statistics
+import json
+import base64
+import codecs
+import time
+import socket
+import threading
+import multiprocessing
+import re
+import csv
+import io
+import tempfile
+import aiohttp
+import numpy as np
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Performance metrics, exposed in the Prometheus text format on /metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class Counter:
+    """Monotonic Prometheus counter keyed by label values (safe to update from driver threads)"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values: Dict[Tuple[str, ...], Any] = {}
+        self.lock = threading.Lock()
+
+    def key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self.lock:
+            return self.values.get(self.key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self.lock:
+            return [(self.name, dict(zip(self.labels, key)), value) for key, value in self.values.items()]
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = value
+
+class Histogram(Counter):
+    """Cumulative-bucket Prometheus histogram"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self.key(labels)
+        with self.lock:
+            # Per-bucket counts, then sum and count
+            state = self.values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples = []
+        with self.lock:
+            for key, state in self.values.items():
+                labels = dict(zip(self.labels, key))
+                for bound, count in zip(self.buckets, state):
+                    samples.append((f"{self.name}_bucket", {**labels, 'le': repr(float(bound))}, count))
+                samples.append((f"{self.name}_bucket", {**labels, 'le': '+Inf'}, state[-1]))
+                samples.append((f"{self.name}_sum", labels, state[-2]))
+                samples.append((f"{self.name}_count", labels, state[-1]))
+        return samples
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[Counter] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        def escape(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                label_text = ','.join(f'{label}="{escape(text)}"' for label, text in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+
+REQUEST_SECONDS = metrics.register(Histogram(
+    'http_request_duration_seconds', 'Time to respond to an HTTP request, by route template', ('method', 'route', 'status')))
+MONGO_COMMAND_SECONDS = metrics.register(Histogram(
+    'mongodb_command_duration_seconds', 'MongoDB command round-trip time', ('command', 'collection')))
+MONGO_COMMAND_FAILURES = metrics.register(Counter(
+    'mongodb_command_failures_total', 'MongoDB commands that returned an error', ('command', 'collection')))
+MONGO_DOCUMENTS_RETURNED = metrics.register(Counter(
+    'mongodb_documents_returned_total', 'Documents returned to the app by find, aggregate and getMore', ('command', 'collection')))
+SHEET_DOWNLOAD_SECONDS = metrics.register(Histogram(
+    'sheet_download_duration_seconds', 'Time spent waiting on a Google Sheets export', ('sheet', 'purpose', 'status')))
+SHEET_DOWNLOAD_BYTES = metrics.register(Counter(
+    'sheet_download_bytes_total', 'Bytes downloaded from Google Sheets exports', ('sheet', 'purpose')))
+SYNC_SECONDS = metrics.register(Histogram(
+    'sync_duration_seconds', 'End-to-end sheet sync time', ('mode', 'status')))
+SYNC_PHASE_SECONDS = metrics.register(Histogram(
+    'sync_phase_duration_seconds', 'Time a sync spent in each phase', ('phase',)))
+SYNC_ROWS_PARSED = metrics.register(Counter(
+    'sync_rows_parsed_total', 'Raw Data rows parsed by syncs'))
+SYNC_PARSE_ROWS_PER_SECOND = metrics.register(Gauge(
+    'sync_parse_rows_per_second', 'Raw Data parse throughput of the most recent sync'))
+CACHE_REQUESTS = metrics.register(Counter(
+    'cache_requests_total', 'Cache lookups, by cache and hit or miss', ('cache', 'result')))
+CACHE_HIT_RATIO = metrics.register(Gauge(
+    'cache_hit_ratio', 'Fraction of lookups served from each cache since startup', ('cache',)))
+
+class SyncCancelled(Exception):
+    """Raised inside a sync at a safe point after its cancellation was requested"""
+
+class SyncProgress:
+    """Phase, counts and timings of one running sync.
+
+    Read by the sync's job status while it runs and logged as its summary
+    record at the end. Cancellation is cooperative: the sync checks
+    ``cancel_requested``, and whether it lost the sync lease, between write
+    batches and before committing.
+    """
+
+    def __init__(self):
+        self.phase = 'starting'
+        self.rows = 0
+        self.deals_written = 0
+        self.downloaded_bytes: Dict[str, int] = {}
+        self.phase_seconds: Dict[str, float] = {}
+        self.parse_rows_per_second: Optional[int] = None
+        self.mql_sql_channels: Optional[int] = None
+        self.history_checkpoint_deals: Optional[int] = None
+        self.cancel_requested = False
+
+    def check_cancelled(self):
+        if self.cancel_requested:
+            raise SyncCancelled("Sync cancelled")
+        lease = current_sync_lease.get()
+        if lease is not None and lease.lost:
+            raise SyncCancelled("Sync lease lost to another worker")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'phase': self.phase,
+            'rows': self.rows,
+            'deals_written': self.deals_written,
+            'downloaded_bytes': dict(self.downloaded_bytes),
+            'phase_seconds': dict(self.phase_seconds),
+            'parse_rows_per_second': self.parse_rows_per_second,
+            'mql_sql_channels': self.mql_sql_channels,
+            'history_checkpoint_deals': self.history_checkpoint_deals
+        }
+
+# Progress of the sync running in this context
+current_sync_progress: ContextVar[Optional[SyncProgress]] = ContextVar('current_sync_progress', default=None)
+
+class SyncLease:
+    """This worker's hold on the cross-worker sync lease, flagged once a renewal fails"""
+
+    def __init__(self):
+        self.lost = False
+
+# Lease held by the sync running in this context
+current_sync_lease: ContextVar[Optional[SyncLease]] = ContextVar('current_sync_lease', default=None)
+
+def record_sync_phase(phase: str, seconds: float):
+    SYNC_PHASE_SECONDS.observe(seconds, phase=phase)
+    progress = current_sync_progress.get()
+    if progress is not None:
+        progress.phase_seconds[phase] = round(progress.phase_seconds.get(phase, 0) + seconds, 4)
+
+@contextmanager
+def sync_phase(phase: str):
+    """Enter a sync phase and record how long it took"""
+    progress = current_sync_progress.get()
+    if progress is not None:
+        progress.phase = phase
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_sync_phase(phase, time.perf_counter() - started)
+
+# Blue/green staging generations are reported under one name to keep label values bounded
+STAGING_COLLECTION_RE = re.compile(r'^(deals|deal_rollups)_[0-9a-f]{12}$')
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Record round-trip time and returned documents of every MongoDB command"""
+
+    def __init__(self):
+        self.collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event):
+        command = event.command
+        target = command.get('collection') if event.command_name == 'getMore' else command.get(event.command_name)
+        collection = STAGING_COLLECTION_RE.sub(r'\1_staging', target) if isinstance(target, str) else ''
+        self.collections[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event):
+        collection = self.collections.pop((event.connection_id, event.request_id), '')
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name, collection=collection)
+        cursor = event.reply.get('cursor')
+        if isinstance(cursor, dict):
+            batch = cursor.get('firstBatch', cursor.get('nextBatch', []))
+            MONGO_DOCUMENTS_RETURNED.inc(len(batch), command=event.command_name, collection=collection)
+
+    def failed(self, event):
+        collection = self.collections.pop((event.connection_id, event.request_id), '')
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, command=event.command_name, collection=collection)
+        MONGO_COMMAND_FAILURES.inc(command=event.command_name, collection=collection)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -29,12 +268,42 @@ app = FastAPI()
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: LOG_FORMAT=json writes one JSON object per line, LOG_LEVEL sets the
+# default level and LOG_LEVELS overrides it per logger, e.g. "parse=DEBUG,sync=WARNING"
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record; fields passed as extra={'fields': {...}} are merged in"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            **getattr(record, 'fields', {})
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+log_handler = logging.StreamHandler()
+if os.environ.get('LOG_FORMAT', 'text') == 'json':
+    log_handler.setFormatter(JsonLogFormatter())
+else:
+    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), handlers=[log_handler])
+
 logger = logging.getLogger(__name__)
+# Subsystem loggers: sheet downloads, row parsing and sync orchestration
+LOG_SUBSYSTEMS = ('sheets', 'parse', 'sync')
+sheets_logger, parse_logger, sync_logger = (logger.getChild(name) for name in LOG_SUBSYSTEMS)
+
+for override in filter(None, os.environ.get('LOG_LEVELS', '').split(',')):
+    name, _, level = override.partition('=')
+    name = name.strip()
+    logging.getLogger(f"{__name__}.{name}" if name in LOG_SUBSYSTEMS else name).setLevel(level.strip().upper())
+
+# Per-row debug events are emitted for one row in this many
+LOG_ROW_SAMPLE_EVERY = max(1, int(os.environ.get('LOG_ROW_SAMPLE_EVERY', '100')))
 
 # Models
 class Deal(BaseModel):
@@ -49,9 +318,11 @@ class Deal(BaseModel):
     amount: float
     potential_size: float
     confidence: str
-    date: str
-    close_date: Optional[str] = None
+    date: Optional[datetime] = None
+    close_date: Optional[datetime] = None
     lead_source: Optional[str] = None
+    hubspot_id: Optional[str] = None
+    row_hash: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class SyncMetadata(BaseModel):
@@ -114,140 +385,529 @@ RAW_DATA_CSV_URL = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/exp
 # MQL/SQL data tab (gid=608527908)
 SHEET_2_CSV_URL = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/export?format=csv&gid=608527908"
 
-async def fetch_raw_data():
-    """Fetch data from Raw Data tab (HubSpot export)"""
-    import aiohttp
-    import csv
-    import io
-
+# Column mapping from the Raw Data tab (HubSpot export) to internal deal fields
+RAW_DATA_COLUMN_MAP = {
+    'Record ID': 'hubspot_id',
+    'dealname': 'deal_name',
+    'dealstage_name': 'stage',
+    'Deal owner': 'ae',
+    'geography': 'region',
+    'Industry': 'industry',
+    'Amount': 'amount',
+    'Confidence': 'confidence',
+    'Create Date': 'date',
+    'Close Date': 'close_date',
+    'Acquisition Channel': 'lead_source',
+}
+
+# Date formats seen in HubSpot exports, tried after ISO 8601 (US month/day order)
+SHEET_DATE_FORMATS = (
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %I:%M %p',
+    '%m/%d/%Y',
+    '%d-%b-%Y',
+    '%b %d, %Y',
+)
+# Accepted forms that name a whole day rather than an instant
+DAY_DATE_FORMATS = ('%Y-%m-%d', '%Y%m%d', *(fmt for fmt in SHEET_DATE_FORMATS if '%H' not in fmt and '%I' not in fmt))
+
+# Columns identifying a deal when the export has no HubSpot record ID
+DEAL_KEY_FIELDS = ('deal_name', 'date')
+
+# Bytes read per chunk when streaming a sheet export
+CSV_CHUNK_SIZE = 64 * 1024
+# Deals parsed and written to MongoDB per batch while streaming
+DEAL_WRITE_BATCH_SIZE = 5000
+# Pool running CPU-bound sheet parsing off the event loop: 'thread' keeps the loop
+# responsive anywhere; 'process' spreads blocks over several cores where the host allows
+# worker processes (each re-imports this module); PARSE_WORKERS=0 parses inline
+PARSE_POOL = os.environ.get('PARSE_POOL', 'thread')
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Outbound HTTP connection pool for sheet downloads
+HTTP_POOL_LIMIT = int(os.environ.get('HTTP_POOL_LIMIT', '10'))
+HTTP_KEEPALIVE_SECONDS = float(os.environ.get('HTTP_KEEPALIVE_SECONDS', '60'))
+HTTP_DNS_CACHE_SECONDS = 300
+# Background sync polling interval; 0 disables the scheduler and lets clients drive syncs
+SYNC_INTERVAL_SECONDS = float(os.environ.get('SYNC_INTERVAL_SECONDS', '30'))
+# Seconds a worker's sync lease stays valid without renewal
+SYNC_LEASE_SECONDS = 300
+# Finished sync jobs kept for GET /sheets/jobs, and how often a running job saves its progress
+SYNC_JOB_HISTORY = int(os.environ.get('SYNC_JOB_HISTORY', '50'))
+SYNC_JOB_PROGRESS_SECONDS = float(os.environ.get('SYNC_JOB_PROGRESS_SECONDS', '1'))
+# Polls within this window reuse the previous change check instead of re-fetching
+CHANGE_CHECK_TTL_SECONDS = float(os.environ.get('CHANGE_CHECK_TTL_SECONDS', '15'))
+# /events streams: how often a worker looks for syncs finished elsewhere, the keepalive
+# interval, and how long one stream lasts before the client reconnects
+EVENTS_POLL_SECONDS = float(os.environ.get('EVENTS_POLL_SECONDS', '2'))
+EVENTS_KEEPALIVE_SECONDS = 15
+EVENTS_STREAM_SECONDS = float(os.environ.get('EVENTS_STREAM_SECONDS', '300'))
+EVENTS_QUEUE_SIZE = 16
+
+# Deal fields clients may project, and the always-present ones they may sort by
+DEAL_FIELDS = {
+    'id', 'hubspot_id', 'deal_name', 'stage', 'ae', 'region', 'industry', 'amount',
+    'potential_size', 'confidence', 'date', 'close_date', 'lead_source', 'row_hash', 'created_at'
+}
+DEAL_DATE_FIELDS = {'date', 'close_date'}
+DEAL_SORT_FIELDS = {'id', 'deal_name', 'stage', 'ae', 'region', 'industry', 'potential_size', 'confidence', 'date'}
+# /deals page sizes, and documents per round trip when streaming NDJSON
+DEALS_DEFAULT_PAGE_SIZE = 100
+DEALS_MAX_PAGE_SIZE = 1000
+DEALS_STREAM_BATCH_SIZE = 1000
+
+# Sections /dashboard can return, and the ones the main dashboard page loads by default
+DASHBOARD_SECTIONS = ('sync_status', 'pipeline', 'ae_performance', 'regional_metrics', 'deals', 'filters', 'lead_funnel', 'mql_sql')
+DASHBOARD_DEFAULT_SECTIONS = ('sync_status', 'pipeline', 'ae_performance', 'regional_metrics', 'deals', 'filters')
+# Sections a sync invalidates when the deals change, and when the MQL/SQL sheet changes
+DASHBOARD_DEAL_SECTIONS = ('pipeline', 'ae_performance', 'regional_metrics', 'deals', 'filters', 'lead_funnel')
+DASHBOARD_MQL_SQL_SECTIONS = ('lead_funnel', 'mql_sql')
+
+# Trend rollup buckets and the dimensions a trend can be split by
+TREND_GRANULARITIES = ('day', 'week', 'month')
+TREND_DIMENSIONS = ('region', 'ae', 'stage')
+ROLLUP_FIELDS = ('date', 'potential_size', *TREND_DIMENSIONS)
+
+# Deal fields whose changes are kept in the append-only history
+HISTORY_FIELDS = ('stage', 'potential_size', 'ae')
+# History events replayed past the newest checkpoint before another one is taken
+HISTORY_CHECKPOINT_EVENTS = int(os.environ.get('HISTORY_CHECKPOINT_EVENTS', '5000'))
+
+# Stage classification for win rate / conversion metrics (compared lowercase)
+WON_STAGES = ['deal won', 'closed won', 'won']
+LOST_STAGES = ['deal lost', 'closed lost', 'lost']
+
+# Aggregation expressions shared by the analytics pipelines
+DEAL_VALUE_EXPR = {'$ifNull': ['$potential_size', 0]}
+STAGE_LOWER_EXPR = {'$toLower': {'$ifNull': ['$stage', '']}}
+WON_DEAL_EXPR = {'$in': [STAGE_LOWER_EXPR, WON_STAGES]}
+CLOSED_DEAL_EXPR = {'$in': [STAGE_LOWER_EXPR, WON_STAGES + LOST_STAGES]}
+
+# Bump when the shape of the materialized analytics snapshot changes
+ANALYTICS_SNAPSHOT_VERSION = 1
+
+# App-lifetime HTTP client for sheet exports (pooled, keep-alive, cached DNS)
+http_session: Optional[aiohttp.ClientSession] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session, creating it on first use outside the app lifecycle"""
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS
+        )
+        http_session = aiohttp.ClientSession(connector=connector)
+    return http_session
+
+def record_sheet_download(sheet: str, purpose: str, status: int, size: int, seconds: float):
+    """Record one Google Sheets export download; ``purpose`` separates syncs from change checks"""
+    SHEET_DOWNLOAD_SECONDS.observe(seconds, sheet=sheet, purpose=purpose, status=status)
+    SHEET_DOWNLOAD_BYTES.inc(size, sheet=sheet, purpose=purpose)
+    progress = current_sync_progress.get()
+    if progress is not None and purpose == 'sync':
+        progress.downloaded_bytes[sheet] = size
+
+async def metered_chunks(chunks: AsyncIterator[bytes], sheet: str, purpose: str, status: int) -> AsyncIterator[bytes]:
+    """Pass a streamed download through, recording its size and the time spent waiting on the network"""
+    waited = 0.0
+    size = 0
+    progress = current_sync_progress.get() if purpose == 'sync' else None
+    iterator = chunks.__aiter__()
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(RAW_DATA_CSV_URL, timeout=aiohttp.ClientTimeout(total=60)) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch raw data sheet: HTTP {response.status}")
-                    return None
-
-                content = await response.text()
-
-                # Parse CSV
-                csv_reader = csv.reader(io.StringIO(content))
-                values = list(csv_reader)
-
-                logger.info(f"Fetched {len(values)} rows from Raw Data tab")
-                return values, content
-
-    except Exception as e:
-        logger.error(f"Error fetching raw data: {e}")
-        return None, None
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                waited += time.perf_counter() - started
+            size += len(chunk)
+            if progress is not None:
+                progress.downloaded_bytes[sheet] = size
+            yield chunk
+    finally:
+        record_sheet_download(sheet, purpose, status, size, waited)
+
+# App-lifetime worker pool for sheet parsing
+parse_executor: Optional[Executor] = None
+
+def get_parse_executor() -> Optional[Executor]:
+    """Return the parse pool, creating it on first use; None when parsing runs inline"""
+    global parse_executor
+    if parse_executor is None and PARSE_WORKERS > 0:
+        if PARSE_POOL == 'process':
+            try:
+                # Spawned rather than forked: the driver and HTTP client hold threads
+                parse_executor = ProcessPoolExecutor(PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+            except (ImportError, NotImplementedError, OSError) as e:
+                # Serverless hosts often lack the POSIX semaphores a process pool needs
+                parse_logger.warning("Cannot start a parse process pool (%s); parsing in threads instead", e)
+        if parse_executor is None:
+            parse_executor = ThreadPoolExecutor(PARSE_WORKERS, thread_name_prefix='parse')
+    return parse_executor
+
+async def run_parse(func, *args):
+    """Run a CPU-bound parse step in the parse pool so the event loop keeps serving requests"""
+    executor = get_parse_executor()
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+def parse_csv_text(text: str) -> List[List[str]]:
+    return list(csv.reader(io.StringIO(text)))
+
+async def stream_csv_records(chunks: AsyncIterator[bytes], hasher) -> AsyncIterator[List[str]]:
+    """Decode a stream of CSV byte chunks into lists of lines holding whole records.
+
+    Every chunk is fed to ``hasher`` as it arrives, so the content hash is known
+    once the stream is exhausted without ever holding the whole body in memory.
+    The lines are left for ``csv.reader`` in the parse pool.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    carry = []
+
+    async for chunk in chunks:
+        hasher.update(chunk)
+        *lines, pending = (pending + decoder.decode(chunk)).split('\n')
+        lines = carry + [line + '\n' for line in lines]
+
+        # Only parse up to the last line that closes every quoted field; an odd
+        # quote count means a multi-line cell continues in the next chunk
+        quote_count = 0
+        complete = 0
+        for i, line in enumerate(lines):
+            quote_count += line.count('"')
+            if quote_count % 2 == 0:
+                complete = i + 1
+
+        carry = lines[complete:]
+        if complete:
+            yield lines[:complete]
+
+    tail = [line for line in carry + [pending + decoder.decode(b'', final=True)] if line]
+    if tail:
+        yield tail
 
 async def fetch_sheet_2_data():
     """Fetch data from Google Sheets second tab (MQL/SQL data)"""
-    import aiohttp
-    import csv
-    import io
-    
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(SHEET_2_CSV_URL, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status != 200:
-                    logger.error(f"Failed to fetch sheet 2: HTTP {response.status}")
-                    return None
-                
-                content = await response.text()
-                
-                # Parse CSV
-                csv_reader = csv.reader(io.StringIO(content))
-                values = list(csv_reader)
-                
-                logger.info(f"Fetched {len(values)} rows from MQL/SQL sheet")
-                return values
+        session = get_http_session()
+        started = time.perf_counter()
+        async with session.get(SHEET_2_CSV_URL, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            if response.status != 200:
+                record_sheet_download('mql_sql', 'sync', response.status, 0, time.perf_counter() - started)
+                sheets_logger.error("Failed to fetch sheet 2: HTTP %s", response.status)
+                return None
+            
+            body = await response.read()
+            record_sheet_download('mql_sql', 'sync', response.status, len(body), time.perf_counter() - started)
+            content = body.decode(response.get_encoding())
+            
+            # Parse CSV
+            values = await run_parse(parse_csv_text, content)
+            
+            sheets_logger.debug("Fetched %d rows from MQL/SQL sheet", len(values))
+            return values
                 
     except Exception as e:
-        logger.error(f"Error fetching sheet 2 data: {e}")
+        sheets_logger.error("Error fetching sheet 2 data: %s", e)
         return None
 
-def parse_raw_data(values: List[List[str]]) -> List[Dict]:
-    """Parse Raw Data tab (HubSpot export) into deal objects"""
-    if not values or len(values) < 2:
+def compute_deal_key(deal: Dict[str, Any]) -> str:
+    """Derive a stable deal key: the HubSpot record ID, else a hash of identifying columns"""
+    if deal.get('hubspot_id'):
+        return f"hs-{deal['hubspot_id']}"
+    identity = '|'.join(str(deal.get(field, '')) for field in DEAL_KEY_FIELDS)
+    return f"row-{hashlib.md5(identity.encode('utf-8')).hexdigest()}"
+
+# Encodes exactly like json.dumps(sort_keys=True, default=str) without building an encoder per call
+ROW_HASH_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+def compute_row_hash(deal: Dict[str, Any]) -> str:
+    """Hash the synced content of a deal so unchanged rows can be skipped"""
+    content = {k: v for k, v in deal.items() if k not in ('id', 'row_hash', 'created_at')}
+    return hashlib.md5(ROW_HASH_ENCODER.encode(content).encode('utf-8')).hexdigest()
+
+@lru_cache(maxsize=65536)
+def parse_sheet_date(value: str) -> Optional[datetime]:
+    """Parse a date cell from the HubSpot export into a UTC datetime (None if unparseable)"""
+    value = value.strip()
+    if not value:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = None
+        for fmt in SHEET_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        if parsed is None:
+            return None
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def is_bare_date(value: str) -> bool:
+    """Whether a date value accepted by parse_sheet_date names a whole day, with no time of day"""
+    value = value.strip()
+    for fmt in DAY_DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+            return True
+        except ValueError:
+            continue
+    return False
+
+def parse_date_param(value: Optional[str], name: str, end_of_range: bool = False) -> Optional[datetime]:
+    """Parse a date_from/date_to query value; a bare date as the end bound covers the whole day"""
+    if not value:
+        return None
+    parsed = parse_sheet_date(value)
+    if parsed is None:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: '{value}'")
+    if end_of_range and is_bare_date(value):
+        parsed += timedelta(days=1)
+    return parsed
+
+def date_range_query(date_from: Optional[str], date_to: Optional[str]) -> Dict[str, Any]:
+    """Mongo predicate on the deal create date for an inclusive date_from/date_to range"""
+    start = parse_date_param(date_from, 'date_from')
+    end = parse_date_param(date_to, 'date_to', end_of_range=True)
+
+    date_range = {}
+    if start:
+        date_range['$gte'] = start
+    if end:
+        # Bare end dates were moved to the following midnight, so the bound is exclusive
+        date_range['$lt' if is_bare_date(date_to) else '$lte'] = end
+    return {'date': date_range} if date_range else {}
+
+def build_header_index(headers: List[str]) -> Dict[str, int]:
+    """Map stripped Raw Data header names to column positions"""
+    return {h.strip(): i for i, h in enumerate(headers)}
+
+# Characters stripped from currency cells before they are parsed as numbers
+CURRENCY_STRIP_TABLE = str.maketrans('', '', '$,₹"')
+
+def parse_amount_cell(value: str) -> float:
+    """Parse a cleaned-up currency cell, treating blanks and junk as 0"""
+    cleaned = value.translate(CURRENCY_STRIP_TABLE).strip()
+    try:
+        return float(cleaned) if cleaned else 0.0
+    except ValueError:
+        return 0.0
+
+def assign_deal_ids(deals: List[Dict], seen_keys: Dict[str, int]):
+    """Suffix the second and later occurrences of a deal key with their count (``-2``, ``-3``) in sheet order"""
+    for deal in deals:
+        deal_key = deal['id']
+        seen_keys[deal_key] = seen_keys.get(deal_key, 0) + 1
+        if seen_keys[deal_key] > 1:
+            deal['id'] = f"{deal_key}-{seen_keys[deal_key]}"
+
+def parse_raw_data_rows(rows: List[List[str]], header_idx: Dict[str, int], seen_keys: Dict[str, int]) -> List[Dict]:
+    """Parse a block of Raw Data rows column by column.
+
+    Resolves each column once, cleans it as a whole and parses every distinct
+    amount and date string only once per block. Cells missing from short rows
+    are ``None`` in a column and leave the field out of the deal.
+    """
+    deals = parse_raw_data_block(rows, header_idx)
+    assign_deal_ids(deals, seen_keys)
+    return deals
+
+def parse_raw_data_lines(lines: List[str], header_idx: Dict[str, int]) -> Tuple[List[Dict], int, float]:
+    """Parse-pool work unit: CSV lines of whole Raw Data records into deals.
+
+    Deal ids are left un-numbered for ``assign_deal_ids``. Returns (deals, rows
+    read, seconds spent).
+    """
+    started = time.perf_counter()
+    rows = list(csv.reader(lines))
+    return parse_raw_data_block(rows, header_idx), len(rows), time.perf_counter() - started
+
+def parse_raw_data_block(rows: List[List[str]], header_idx: Dict[str, int]) -> List[Dict]:
+    """Columnar parse of a block of rows, with each deal's id set to its un-numbered key"""
+    rows = [row for row in rows if row]
+    if not rows:
         return []
 
-    headers = values[0]
-    deals = []
+    mapped = {field_name: header_idx[col_name] for col_name, field_name in RAW_DATA_COLUMN_MAP.items() if col_name in header_idx}
+    if not mapped:
+        return []
 
-    # Build header index map for efficient lookup
-    header_idx = {h.strip(): i for i, h in enumerate(headers)}
-
-    # Column mapping from HubSpot export to internal fields
-    # Using column names from the Raw Data tab
-    column_map = {
-        'dealname': 'deal_name',
-        'dealstage_name': 'stage',
-        'Deal owner': 'ae',
-        'geography': 'region',
-        'Industry': 'industry',
-        'Amount': 'amount',
-        'Confidence': 'confidence',
-        'Create Date': 'date',
-        'Close Date': 'close_date',
-        'Acquisition Channel': 'lead_source',
+    # Transpose the block once, padding short rows so their missing cells read as None
+    width = max(mapped.values()) + 1
+    cells = list(zip(*(row if len(row) >= width else row + [None] * (width - len(row)) for row in rows)))
+    columns: Dict[str, List[Optional[str]]] = {
+        field_name: [
+            value.strip() if isinstance(value, str) else (None if value is None else '')
+            for value in cells[idx]
+        ]
+        for field_name, idx in mapped.items()
     }
 
-    logger.info(f"Raw Data tab has {len(headers)} columns, {len(values)-1} data rows")
-
-    for row_num, row in enumerate(values[1:], start=2):
-        if not row or len(row) == 0:
-            continue
+    # Rows without a deal name or stage, and rejected deals, are skipped
+    names = columns.get('deal_name') or [None] * len(rows)
+    stages = columns.get('stage') or [None] * len(rows)
+    keep = [i for i, (name, stage) in enumerate(zip(names, stages)) if name and stage and stage.lower() != 'reject']
+    if not keep:
+        return []
+    columns = {field: [values[i] for i in keep] for field, values in columns.items()}
+
+    # Each distinct amount and date string is parsed once for the whole block
+    if 'amount' in columns:
+        amounts = {value: parse_amount_cell(value) for value in set(columns['amount']) if value is not None}
+        columns['amount'] = [None if value is None else amounts[value] for value in columns['amount']]
+    date_strings = set(columns.get('date', ())) | set(columns.get('close_date', ()))
+    dates = {value: parse_sheet_date(value) for value in date_strings if value}
+    # The row hash encodes dates through default=str; handing it the strings directly is identical
+    date_text = {value: None if parsed is None else str(parsed) for value, parsed in dates.items()}
+
+    now = datetime.now(timezone.utc)
+    default_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    default_date_text = str(default_date)
+    created_at = now.isoformat()
+    fields = list(columns)
 
+    deals = []
+    for i in range(len(keep)):
         deal_data = {}
+        for field in fields:
+            value = columns[field][i]
+            if value is not None:
+                deal_data[field] = value
+        deal_data['potential_size'] = deal_data.get('amount', 0.0)
+
+        deal_key = compute_deal_key(deal_data)
+
+        for field, default in (('ae', 'Unknown'), ('region', 'Unknown'), ('industry', 'Unknown'), ('confidence', 'Medium')):
+            if not deal_data.get(field):
+                deal_data[field] = default
+
+        hashed = dict(deal_data)
+        if deal_data.get('date'):
+            hashed['date'] = date_text[deal_data['date']]
+            deal_data['date'] = dates[deal_data['date']]
+        else:
+            hashed['date'] = default_date_text
+            deal_data['date'] = default_date
+        if 'close_date' in deal_data:
+            hashed['close_date'] = date_text.get(deal_data['close_date'])
+            deal_data['close_date'] = dates.get(deal_data['close_date'])
+
+        deal_data['id'] = deal_key
+        deal_data['row_hash'] = hashlib.md5(ROW_HASH_ENCODER.encode(hashed).encode('utf-8')).hexdigest()
+        deal_data['created_at'] = created_at
+        deals.append(deal_data)
 
-        # Extract fields using column mapping
-        for col_name, field_name in column_map.items():
-            idx = header_idx.get(col_name)
-            if idx is not None and idx < len(row):
-                value = row[idx].strip() if isinstance(row[idx], str) and row[idx] else ""
+    return deals
 
-                # Parse numeric fields
-                if field_name in ['amount', 'potential_size']:
-                    try:
-                        cleaned = str(value).replace('$', '').replace(',', '').replace('₹', '').replace('"', '').strip()
-                        deal_data[field_name] = float(cleaned) if cleaned else 0.0
-                    except:
-                        deal_data[field_name] = 0.0
-                else:
-                    deal_data[field_name] = value
+def parse_raw_data(values: List[List[str]]) -> List[Dict]:
+    """Parse Raw Data tab (HubSpot export) into deal objects"""
+    if not values or len(values) < 2:
+        return []
 
-        # Use amount as potential_size if not separately available
-        if 'potential_size' not in deal_data or deal_data.get('potential_size', 0) == 0:
-            deal_data['potential_size'] = deal_data.get('amount', 0.0)
+    headers = values[0]
+    header_idx = build_header_index(headers)
 
-        # Skip rows without deal name or stage
-        if not deal_data.get('deal_name') or not deal_data.get('stage'):
-            continue
+    parse_logger.debug("Raw Data tab has %d columns, %d data rows", len(headers), len(values) - 1)
 
-        # Skip rejected/archived deals if needed (optional - keeping all for now)
-        stage = deal_data.get('stage', '').lower()
-        if stage == 'reject':
-            continue  # Skip rejected deals
-
-        # Set defaults for missing fields
-        if not deal_data.get('ae'):
-            deal_data['ae'] = 'Unknown'
-        if not deal_data.get('region'):
-            deal_data['region'] = 'Unknown'
-        if not deal_data.get('industry'):
-            deal_data['industry'] = 'Unknown'
-        if not deal_data.get('confidence'):
-            deal_data['confidence'] = 'Medium'
-        if not deal_data.get('date'):
-            deal_data['date'] = datetime.now().strftime('%Y-%m-%d')
-
-        deal_data['id'] = str(uuid.uuid4())
-        deal_data['created_at'] = datetime.now(timezone.utc).isoformat()
-        deals.append(deal_data)
+    seen_keys = {}
+    deals = []
+    for start in range(1, len(values), DEAL_WRITE_BATCH_SIZE):
+        deals.extend(parse_raw_data_rows(values[start:start + DEAL_WRITE_BATCH_SIZE], header_idx, seen_keys))
 
-    logger.info(f"Parsed {len(deals)} deals from Raw Data tab")
+    parse_logger.debug("Parsed %d deals from Raw Data tab", len(deals))
     return deals
-            
+
+async def ingest_raw_data(records: AsyncIterator[List[str]], writer) -> int:
+    """Parse streamed Raw Data records in the parse pool and hand them to ``writer`` in bounded batches.
+
+    Blocks of about DEAL_WRITE_BATCH_SIZE records are parsed concurrently, up
+    to PARSE_WORKERS at a time, and written in sheet order so repeated deal
+    keys are numbered exactly as by ``parse_raw_data``.
+    """
+    header_idx = None
+    seen_keys = {}
+    block = []
+    in_flight = deque()
+    progress = current_sync_progress.get() or SyncProgress()
+    progress.phase = 'loading'
+    row_count = 0
+    deal_count = 0
+    parse_seconds = 0.0
+    write_seconds = 0.0
+
+    async def write_next():
+        nonlocal row_count, deal_count, parse_seconds, write_seconds
+        deals, rows, seconds = await in_flight.popleft()
+        row_count += rows
+        parse_seconds += seconds
+        progress.rows = row_count
+        assign_deal_ids(deals, seen_keys)
+        parse_logger.debug("Parsed %d deals from a block of %d rows", len(deals), rows)
+        # Cancelling between batches leaves every written batch whole
+        progress.check_cancelled()
+        if deals:
+            started = time.perf_counter()
+            await writer.write(deals)
+            write_seconds += time.perf_counter() - started
+            deal_count += len(deals)
+            progress.deals_written = deal_count
+
+    def submit():
+        in_flight.append(asyncio.ensure_future(run_parse(parse_raw_data_lines, list(block), header_idx)))
+        block.clear()
+
+    try:
+        async for lines in records:
+            if header_idx is None:
+                # csv.reader consumes only the header's lines, the rest are data
+                remaining = iter(lines)
+                header = next(csv.reader(remaining), None)
+                if header is None:
+                    continue
+                header_idx = build_header_index(header)
+                parse_logger.debug("Raw Data tab has %d columns", len(header))
+                lines = list(remaining)
+
+            block.extend(lines)
+            if len(block) >= DEAL_WRITE_BATCH_SIZE:
+                submit()
+                while len(in_flight) > max(1, PARSE_WORKERS):
+                    await write_next()
+
+        if block:
+            submit()
+        while in_flight:
+            await write_next()
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+    # Parse time is summed over the pool, so rows/sec is per worker
+    record_sync_phase('parse', parse_seconds)
+    record_sync_phase('write', write_seconds)
+    SYNC_ROWS_PARSED.inc(row_count)
+    rows_per_second = row_count / parse_seconds if parse_seconds else None
+    if rows_per_second:
+        SYNC_PARSE_ROWS_PER_SECOND.set(rows_per_second)
+
+    progress.parse_rows_per_second = rows_per_second and round(rows_per_second)
+    parse_logger.debug("Parsed %d deals from %d Raw Data rows", deal_count, row_count)
+    return deal_count
+
 def parse_mql_sql_data(values: List[List[str]]) -> Dict[str, Any]:
     """Parse MQL and SQL data from the sheet"""
     mql_sql_data = {
@@ -272,22 +932,22 @@ def parse_mql_sql_data(values: List[List[str]]) -> Dict[str, Any]:
             if 'MQL - US' in cell_6:
                 current_section = 'mql_us'
                 header_row_index = None
-                logger.info(f"Found MQL - US section at row {i}")
+                parse_logger.debug("Found MQL - US section at row %d", i)
                 continue
             elif 'MQL - India' in cell_6:
                 current_section = 'mql_india'
                 header_row_index = None
-                logger.info(f"Found MQL - India section at row {i}")
+                parse_logger.debug("Found MQL - India section at row %d", i)
                 continue
             elif 'SQL - US' in cell_6:
                 current_section = 'sql_us'
                 header_row_index = None
-                logger.info(f"Found SQL - US section at row {i}")
+                parse_logger.debug("Found SQL - US section at row %d", i)
                 continue
             elif 'SQL - India' in cell_6:
                 current_section = 'sql_india'
                 header_row_index = None
-                logger.info(f"Found SQL - India section at row {i}")
+                parse_logger.debug("Found SQL - India section at row %d", i)
                 continue
         
         # If we're in a section, look for the header row with "Acquistion Channel"
@@ -304,7 +964,7 @@ def parse_mql_sql_data(values: List[List[str]]) -> Dict[str, Any]:
                 
                 mql_sql_data[current_section]['dates'] = dates
                 header_row_index = i
-                logger.info(f"Found header row for {current_section} at {i}, dates: {dates}")
+                parse_logger.debug("Found header row for %s at %d, dates: %s", current_section, i, dates)
                 continue
         
         # Parse data rows after header
@@ -324,7 +984,7 @@ def parse_mql_sql_data(values: List[List[str]]) -> Dict[str, Any]:
                             except:
                                 totals.append(0)
                     mql_sql_data[current_section]['totals'] = totals
-                    logger.info(f"Parsed totals for {current_section}: {totals}")
+                    parse_logger.debug("Parsed totals for %s: %s", current_section, totals)
                 
                 # Reset for next section
                 current_section = None
@@ -344,7 +1004,7 @@ def parse_mql_sql_data(values: List[List[str]]) -> Dict[str, Any]:
                             except:
                                 totals.append(0)
                     mql_sql_data[current_section]['totals'] = totals
-                    logger.info(f"Parsed totals for {current_section}: {totals}")
+                    parse_logger.debug("Parsed totals for %s: %s", current_section, totals)
                 continue
             
             # Parse channel data (columns C-H, indices 2-7)
@@ -360,18 +1020,24 @@ def parse_mql_sql_data(values: List[List[str]]) -> Dict[str, Any]:
             # Only add if has some data
             if channel_values and sum(channel_values) > 0:
                 mql_sql_data[current_section]['channels'][channel_name] = channel_values
-                logger.info(f"Parsed {current_section} - {channel_name}: {channel_values}")
+                # Per-row events are sampled so large sheets don't flood the log
+                if i % LOG_ROW_SAMPLE_EVERY == 0 and parse_logger.isEnabledFor(logging.DEBUG):
+                    parse_logger.debug("Parsed %s - %s: %s (row %d, 1 in %d rows logged)",
+                                       current_section, channel_name, channel_values, i, LOG_ROW_SAMPLE_EVERY)
     
-    logger.info(f"Final MQL/SQL data structure: {list(mql_sql_data.keys())}")
-    for section, data in mql_sql_data.items():
-        logger.info(f"{section}: {len(data['channels'])} channels, {len(data['dates'])} dates, totals: {data['totals']}")
+    if parse_logger.isEnabledFor(logging.DEBUG):
+        for section, data in mql_sql_data.items():
+            parse_logger.debug("%s: %d channels, %d dates, totals: %s",
+                               section, len(data['channels']), len(data['dates']), data['totals'])
     
     return mql_sql_data
 
-async def sync_mql_sql_data(values: List[List[str]]):
-    """Sync MQL/SQL data to database"""
+async def sync_mql_sql_data(values: List[List[str]]) -> bool:
+    """Sync MQL/SQL data to database; True if the data differs from what was stored"""
     try:
-        mql_sql_data = parse_mql_sql_data(values)
+        mql_sql_data = await run_parse(parse_mql_sql_data, values)
+        content_hash = compute_content_hash(json.dumps(mql_sql_data, sort_keys=True))
+        previous = await db.mql_sql_metrics.find_one({}, {'_id': 0, 'content_hash': 1})
         
         # Store in database
         await db.mql_sql_metrics.delete_many({})
@@ -379,129 +1045,1594 @@ async def sync_mql_sql_data(values: List[List[str]]):
         doc = {
             'id': str(uuid.uuid4()),
             'data': mql_sql_data,
+            'content_hash': content_hash,
             'last_updated': datetime.now(timezone.utc).isoformat()
         }
         
         await db.mql_sql_metrics.insert_one(doc)
-        logger.info("MQL/SQL data synced successfully")
+        
+        progress = current_sync_progress.get()
+        if progress is not None:
+            progress.mql_sql_channels = sum(len(data['channels']) for data in mql_sql_data.values())
+
+        return previous is None or previous.get('content_hash') != content_hash
         
     except Exception as e:
-        logger.error(f"Error syncing MQL/SQL data: {e}")
+        sync_logger.error("Error syncing MQL/SQL data: %s", e)
+        return False
+
+# Indexes backing the deals query surface: lookups by id during sync, the /deals
+# filters (single fields via compound prefixes plus the common pairings) and date ranges
+DEAL_INDEXES = [
+    IndexModel([('id', ASCENDING)], name='id_1', unique=True),
+    IndexModel([('ae', ASCENDING), ('stage', ASCENDING)], name='ae_stage'),
+    IndexModel([('region', ASCENDING), ('stage', ASCENDING)], name='region_stage'),
+    IndexModel([('region', ASCENDING), ('ae', ASCENDING)], name='region_ae'),
+    IndexModel([('stage', ASCENDING)], name='stage'),
+    IndexModel([('industry', ASCENDING), ('stage', ASCENDING)], name='industry_stage'),
+    IndexModel([('date', ASCENDING)], name='date'),
+]
+
+# Trend rollups: one row per (granularity, dimension, key, bucket), read by bucket range
+ROLLUP_INDEXES = [
+    IndexModel(
+        [('granularity', ASCENDING), ('dimension', ASCENDING), ('key', ASCENDING), ('bucket', ASCENDING)],
+        name='rollup_key',
+        unique=True
+    ),
+    IndexModel([('granularity', ASCENDING), ('dimension', ASCENDING), ('bucket', ASCENDING)], name='rollup_range'),
+]
+
+# Every index this app manages, per collection; anything else on these collections is dropped
+MANAGED_INDEXES = {
+    'deals': DEAL_INDEXES,
+    'deal_rollups': ROLLUP_INDEXES,
+    'deal_history': [
+        IndexModel([('at', ASCENDING)], name='at'),
+        IndexModel([('deal_id', ASCENDING), ('at', ASCENDING)], name='deal_id_at'),
+    ],
+    'deal_checkpoints': [
+        IndexModel([('as_of', ASCENDING), ('deal_id', ASCENDING)], name='as_of_deal_id', unique=True),
+    ],
+    'history_checkpoints': [
+        IndexModel([('as_of', DESCENDING)], name='as_of_desc', unique=True),
+    ],
+    'sync_metadata': [
+        IndexModel([('last_sync', DESCENDING)], name='last_sync_desc'),
+    ],
+    'sync_jobs': [
+        IndexModel([('id', ASCENDING)], name='id', unique=True),
+        IndexModel([('created_at', DESCENDING)], name='created_at_desc'),
+    ],
+    'analytics_snapshots': [
+        IndexModel([('version', ASCENDING), ('content_hash', ASCENDING)], name='version_content_hash', unique=True),
+    ],
+}
+
+async def reconcile_indexes(collection, models: List[IndexModel]):
+    """Make the collection's indexes match the declared models"""
+    declared = {model.document['name']: model.document for model in models}
+    existing = await collection.index_information()
+
+    for name, info in existing.items():
+        if name == '_id_':
+            continue
+        spec = declared.get(name)
+        # Undeclared indexes, and declared ones whose definition changed, are rebuilt
+        if spec is None or list(spec['key'].items()) != list(info['key']) or spec.get('unique', False) != info.get('unique', False):
+            logger.info("Dropping index %s.%s", collection.name, name)
+            await collection.drop_index(name)
+
+    if models:
+        await collection.create_indexes(models)
+
+async def ensure_deal_indexes(collection):
+    """Create the indexes a deals collection needs before it serves reads"""
+    await collection.create_indexes(DEAL_INDEXES)
+
+def trend_bucket(date: datetime, granularity: str) -> datetime:
+    """Start of the day, ISO week (Monday) or month containing ``date``, in UTC"""
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    day = date.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+class RollupDeltas:
+    """Per-bucket deal count and value changes produced by one sync"""
+
+    def __init__(self):
+        self.deltas: Dict[Tuple[str, datetime, str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+
+    def add(self, deal: Dict[str, Any], sign: int = 1):
+        date = deal.get('date')
+        # Deals synced before dates were parsed (or with unparseable dates) have no bucket
+        if not isinstance(date, datetime):
+            return
+
+        value = deal.get('potential_size') or 0
+        for granularity in TREND_GRANULARITIES:
+            bucket = trend_bucket(date, granularity)
+            for dimension in ('all', *TREND_DIMENSIONS):
+                key = '' if dimension == 'all' else (deal.get(dimension) or 'Unknown')
+                delta = self.deltas[(granularity, bucket, dimension, key)]
+                delta[0] += sign
+                delta[1] += sign * value
+
+    def merge(self, other: 'RollupDeltas'):
+        for bucket, (deals, value) in other.deltas.items():
+            delta = self.deltas[bucket]
+            delta[0] += deals
+            delta[1] += value
+
+    def documents(self) -> List[Dict[str, Any]]:
+        return [
+            {'granularity': granularity, 'bucket': bucket, 'dimension': dimension, 'key': key, 'deals': deals, 'value': value}
+            for (granularity, bucket, dimension, key), (deals, value) in self.deltas.items()
+            if deals
+        ]
+
+    async def apply(self, collection):
+        """Add the deltas onto existing rollup rows, dropping buckets left without deals.
+
+        Applied deltas are cleared, so a writer aborted after its commit applied
+        them does not count them twice.
+        """
+        operations = [
+            UpdateOne(
+                {'granularity': granularity, 'bucket': bucket, 'dimension': dimension, 'key': key},
+                {'$inc': {'deals': deals, 'value': value}},
+                upsert=True
+            )
+            for (granularity, bucket, dimension, key), (deals, value) in self.deltas.items()
+            if deals or value
+        ]
+        for start in range(0, len(operations), DEAL_WRITE_BATCH_SIZE):
+            await collection.bulk_write(operations[start:start + DEAL_WRITE_BATCH_SIZE], ordered=False)
+        self.deltas.clear()
+        if operations:
+            await collection.delete_many({'deals': {'$lte': 0}})
+
+class DealHistory:
+    """Per-deal history events (inserted, changed fields, deleted) produced by one sync"""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+
+    def record(self, previous: Optional[Dict[str, Any]], deal: Dict[str, Any]):
+        if previous is None:
+            self.events.append({
+                'deal_id': deal['id'],
+                'op': 'insert',
+                'changes': {field: deal.get(field) for field in HISTORY_FIELDS}
+            })
+            return
+
+        changes = {field: deal.get(field) for field in HISTORY_FIELDS if deal.get(field) != previous.get(field)}
+        if changes:
+            self.events.append({'deal_id': deal['id'], 'op': 'update', 'changes': changes})
+
+    def record_delete(self, deal_id: str):
+        self.events.append({'deal_id': deal_id, 'op': 'delete'})
+
+    async def append(self):
+        """Append this sync's events, taking a checkpoint once enough have built up"""
+        if not self.events:
+            return
+
+        at = datetime.now(timezone.utc)
+        for start in range(0, len(self.events), DEAL_WRITE_BATCH_SIZE):
+            batch = [{**event, 'at': at} for event in self.events[start:start + DEAL_WRITE_BATCH_SIZE]]
+            await db.deal_history.insert_many(batch, ordered=False)
+        self.events = []
+
+        latest = await db.history_checkpoints.find_one({}, sort=[('as_of', DESCENDING)])
+        pending = await db.deal_history.count_documents({'at': {'$gt': latest['as_of']}}) if latest else None
+        if pending is None or pending >= HISTORY_CHECKPOINT_EVENTS:
+            await write_history_checkpoint(at)
+
+async def write_history_checkpoint(as_of: datetime):
+    """Store the tracked fields of every live deal as the state at ``as_of``"""
+    # Rows of an interrupted checkpoint are never read, since the marker below is written last
+    await db.deal_checkpoints.delete_many({'as_of': as_of})
+
+    batch = []
+    deal_count = 0
+    async for deal in db.deals.find({}, {'_id': 0, 'id': 1, **{field: 1 for field in HISTORY_FIELDS}}):
+        batch.append({'as_of': as_of, 'deal_id': deal.pop('id'), **deal})
+        if len(batch) >= DEAL_WRITE_BATCH_SIZE:
+            await db.deal_checkpoints.insert_many(batch, ordered=False)
+            deal_count += len(batch)
+            batch = []
+    if batch:
+        await db.deal_checkpoints.insert_many(batch, ordered=False)
+        deal_count += len(batch)
+
+    await db.history_checkpoints.insert_one({'as_of': as_of, 'deals': deal_count})
+    # Reported in the sync's summary record
+    progress = current_sync_progress.get()
+    if progress is not None:
+        progress.history_checkpoint_deals = deal_count
+    sync_logger.debug("Wrote history checkpoint of %d deals as of %s", deal_count, as_of.isoformat())
+
+async def reconstruct_deals_as_of(as_of: datetime) -> Dict[str, Dict[str, Any]]:
+    """Tracked fields of every deal as they stood at ``as_of``, keyed by deal id.
+
+    Starts from the newest checkpoint at or before ``as_of`` and replays the
+    history events recorded after it.
+    """
+    state: Dict[str, Dict[str, Any]] = {}
+    window = {'$lte': as_of}
+
+    checkpoint = await db.history_checkpoints.find_one({'as_of': {'$lte': as_of}}, sort=[('as_of', DESCENDING)])
+    if checkpoint:
+        async for row in db.deal_checkpoints.find({'as_of': checkpoint['as_of']}, {'_id': 0, 'as_of': 0}):
+            state[row.pop('deal_id')] = row
+        window['$gt'] = checkpoint['as_of']
+
+    async for event in db.deal_history.find({'at': window}, {'_id': 0}, sort=[('at', ASCENDING)]):
+        if event['op'] == 'delete':
+            state.pop(event['deal_id'], None)
+        else:
+            state.setdefault(event['deal_id'], {}).update(event['changes'])
+    return state
+
+class IncrementalDealWriter:
+    """Apply streamed deal batches as inserts/updates, deleting missing deals on commit"""
+
+    def __init__(self):
+        # Stored row hash plus the fields trend rollups are keyed on, per deal id
+        self.stored: Dict[str, Dict[str, Any]] = {}
+        self.seen_ids = set()
+        self.rollups = RollupDeltas()
+        self.history = DealHistory()
+        self.changes = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'full_resync': False}
+
+    async def open(self):
+        await ensure_deal_indexes(db.deals)
+        projection = {'_id': 0, 'id': 1, 'row_hash': 1, **{field: 1 for field in (*ROLLUP_FIELDS, *HISTORY_FIELDS)}}
+        async for doc in db.deals.find({}, projection):
+            self.stored[doc['id']] = doc
+
+    async def write(self, deals: List[Dict[str, Any]]):
+        # Rollup deltas and history of a batch only count once its write succeeded
+        operations = []
+        rollups = RollupDeltas()
+        history = DealHistory()
+        changes = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        for deal in deals:
+            self.seen_ids.add(deal['id'])
+            stored = self.stored.get(deal['id'])
+            if stored is None:
+                operations.append(InsertOne(deal))
+                rollups.add(deal)
+                history.record(None, deal)
+                changes['inserted'] += 1
+            elif stored.get('row_hash') != deal['row_hash']:
+                # Keep the original created_at of deals that already exist, and drop
+                # fields whose cells were emptied or cut off, as a full resync would
+                fields = {k: v for k, v in deal.items() if k != 'created_at'}
+                update = {'$set': fields}
+                missing = {field: '' for field in RAW_DATA_COLUMN_MAP.values() if field not in deal}
+                if missing:
+                    update['$unset'] = missing
+                operations.append(UpdateOne({'id': deal['id']}, update))
+                rollups.add(stored, -1)
+                rollups.add(deal)
+                history.record(stored, deal)
+                changes['updated'] += 1
+            else:
+                changes['unchanged'] += 1
+
+        if operations:
+            await db.deals.bulk_write(operations, ordered=False)
+
+        self.rollups.merge(rollups)
+        self.history.events.extend(history.events)
+        for field, count in changes.items():
+            self.changes[field] += count
+
+    async def commit(self) -> Dict[str, Any]:
+        # Deletes go last so readers never observe a shrunken collection mid-sync
+        removed_ids = list(self.stored.keys() - self.seen_ids)
+        for start in range(0, len(removed_ids), DEAL_WRITE_BATCH_SIZE):
+            await db.deals.delete_many({'id': {'$in': removed_ids[start:start + DEAL_WRITE_BATCH_SIZE]}})
+        for deal_id in removed_ids:
+            self.rollups.add(self.stored[deal_id], -1)
+            self.history.record_delete(deal_id)
+        self.changes['deleted'] = len(removed_ids)
+
+        await self.rollups.apply(db.deal_rollups)
+        await self.history.append()
+        return self.changes
+
+    async def abort(self):
+        # Rows already written are valid deals, so keep their rollups and history
+        # in step with them; only the deletes are skipped
+        try:
+            await self.rollups.apply(db.deal_rollups)
+            await self.history.append()
+        except Exception:
+            sync_logger.exception("Could not record rollups and history of an aborted sync")
+
+class BlueGreenDealWriter:
+    """Load streamed deal batches into a staging collection and swap it in on commit"""
+
+    def __init__(self):
+        generation = uuid.uuid4().hex[:12]
+        self.staging = db[f"deals_{generation}"]
+        self.rollup_staging = db[f"deal_rollups_{generation}"]
+        self.rollups = RollupDeltas()
+        self.history = DealHistory()
+        # Tracked fields of the live generation, so the reload is still recorded as deltas
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.seen_ids = set()
+        self.changes = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'full_resync': True}
+
+    async def open(self):
+        # Leftovers from interrupted loads must not accumulate
+        for name in await db.list_collection_names(filter={'name': {'$regex': '^(deals|deal_rollups)_'}}):
+            await db[name].drop()
+        await ensure_deal_indexes(self.staging)
+        async for doc in db.deals.find({}, {'_id': 0, 'id': 1, **{field: 1 for field in HISTORY_FIELDS}}):
+            self.previous[doc['id']] = doc
+
+    async def write(self, deals: List[Dict[str, Any]]):
+        await self.staging.insert_many([dict(deal) for deal in deals], ordered=False)
+        for deal in deals:
+            self.rollups.add(deal)
+            self.history.record(self.previous.get(deal['id']), deal)
+            self.seen_ids.add(deal['id'])
+        self.changes['inserted'] += len(deals)
+
+    async def commit(self) -> Dict[str, Any]:
+        # Trend rollups are rebuilt alongside the deals and swapped in the same way
+        rollup_docs = self.rollups.documents()
+        await self.rollup_staging.create_indexes(ROLLUP_INDEXES)
+        for start in range(0, len(rollup_docs), DEAL_WRITE_BATCH_SIZE):
+            await self.rollup_staging.insert_many(rollup_docs[start:start + DEAL_WRITE_BATCH_SIZE], ordered=False)
+
+        # dropTarget replaces the live collection in one step and discards the old generation
+        await self.staging.rename('deals', dropTarget=True)
+        if rollup_docs:
+            await self.rollup_staging.rename('deal_rollups', dropTarget=True)
+        else:
+            await self.rollup_staging.drop()
+            await db.deal_rollups.delete_many({})
+
+        for deal_id in self.previous.keys() - self.seen_ids:
+            self.history.record_delete(deal_id)
+        await self.history.append()
+        sync_logger.debug("Swapped in %d deals from %s", self.changes['inserted'], self.staging.name)
+        return self.changes
+
+    async def abort(self):
+        await self.staging.drop()
+        await self.rollup_staging.drop()
+
+async def open_deal_writer(force_full: bool = False):
+    """Pick how this sync writes deals: patch the live collection, or reload it blue/green"""
+    # Without stored row hashes (first sync, or deals from before stable ids) there is nothing
+    # to diff; without rollups for dated deals there is nothing to apply deltas to
+    needs_full = (
+        force_full
+        or not await db.deals.find_one({'row_hash': {'$exists': True}}, {'_id': 1})
+        or (not await db.deal_rollups.find_one({}, {'_id': 1})
+            and await db.deals.find_one({'date': {'$type': 'date'}}, {'_id': 1}))
+    )
+    if needs_full:
+        writer = BlueGreenDealWriter()
+    else:
+        writer = IncrementalDealWriter()
+    await writer.open()
+    return writer
+
+async def iter_spooled(spool) -> AsyncIterator[bytes]:
+    """Replay a body spooled to a temporary file as a stream of chunks"""
+    spool.seek(0)
+    while chunk := spool.read(CSV_CHUNK_SIZE):
+        yield chunk
+
+def source_validators(response) -> Dict[str, Optional[str]]:
+    """HTTP cache validators of a sheet export response, used for conditional re-fetches"""
+    return {
+        'source_etag': response.headers.get('ETag'),
+        'source_last_modified': response.headers.get('Last-Modified')
+    }
+
+async def stream_raw_data(writer, prefetched: Optional[Dict[str, Any]] = None) -> Tuple[int, str, Dict[str, Optional[str]]]:
+    """Stream the Raw Data tab into ``writer``.
+
+    Uses the body already spooled by a change check when ``prefetched`` is
+    given instead of downloading it again. Returns (deals parsed, content hash,
+    source validators).
+    """
+    hasher = hashlib.md5()
+
+    if prefetched is not None:
+        records = stream_csv_records(iter_spooled(prefetched['spool']), hasher)
+        deal_count = await ingest_raw_data(records, writer)
+        return deal_count, hasher.hexdigest(), prefetched['validators']
+
+    session = get_http_session()
+    started = time.perf_counter()
+    async with session.get(RAW_DATA_CSV_URL, timeout=aiohttp.ClientTimeout(total=60)) as response:
+        if response.status != 200:
+            record_sheet_download('raw_data', 'sync', response.status, 0, time.perf_counter() - started)
+            sheets_logger.error("Failed to fetch raw data sheet: HTTP %s", response.status)
+            raise HTTPException(status_code=500, detail="Failed to fetch sheet data. Please ensure the Google Sheet is publicly accessible.")
+
+        chunks = metered_chunks(response.content.iter_chunked(CSV_CHUNK_SIZE), 'raw_data', 'sync', response.status)
+        records = stream_csv_records(chunks, hasher)
+        deal_count = await ingest_raw_data(records, writer)
+        validators = source_validators(response)
+
+    return deal_count, hasher.hexdigest(), validators
 
 def compute_content_hash(content: str) -> str:
     """Compute MD5 hash of content for change detection"""
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
 
-@api_router.post("/sheets/sync")
-async def sync_sheets():
-    """Sync data from Google Sheets to MongoDB"""
+# Analytics computations (server-side aggregation over the deals collection).
+# Each metric is a set of $facet branches so several can share one pass over the deals.
+PIPELINE_FACETS = {
+    'totals': [
+        {'$group': {
+            '_id': None,
+            'total_deals': {'$sum': 1},
+            'total_value': {'$sum': DEAL_VALUE_EXPR},
+            'won_deals': {'$sum': {'$cond': [WON_DEAL_EXPR, 1, 0]}},
+            'closed_deals': {'$sum': {'$cond': [CLOSED_DEAL_EXPR, 1, 0]}}
+        }}
+    ],
+    'stages': [
+        {'$group': {
+            '_id': {'$ifNull': ['$stage', 'Unknown']},
+            'count': {'$sum': 1},
+            'value': {'$sum': DEAL_VALUE_EXPR}
+        }}
+    ]
+}
+
+AE_PERFORMANCE_FACETS = {
+    'ae_performance': [
+        {'$match': {'ae': {'$nin': [None, '']}}},
+        {'$group': {
+            '_id': '$ae',
+            'total_deals': {'$sum': 1},
+            'total_value': {'$sum': DEAL_VALUE_EXPR},
+            'won_deals': {'$sum': {'$cond': [WON_DEAL_EXPR, 1, 0]}},
+            'total_closed': {'$sum': {'$cond': [CLOSED_DEAL_EXPR, 1, 0]}}
+        }}
+    ]
+}
+
+REGIONAL_FACETS = {
+    'regional_metrics': [
+        {'$match': {'region': {'$nin': [None, '']}}},
+        {'$group': {
+            '_id': '$region',
+            'total_deals': {'$sum': 1},
+            'total_value': {'$sum': DEAL_VALUE_EXPR}
+        }}
+    ]
+}
+
+def distinct_values_facet(field: str) -> List[Dict[str, Any]]:
+    return [
+        {'$match': {field: {'$nin': [None, '']}}},
+        {'$group': {'_id': f'${field}'}},
+        {'$sort': {'_id': 1}}
+    ]
+
+# Response key -> deal field of each dashboard filter. The facets get their own
+# '<field>_options' names so they never collide with the analytics facets.
+FILTER_OPTION_FIELDS = {
+    'aes': 'ae',
+    'regions': 'region',
+    'stages': 'stage',
+    'industries': 'industry'
+}
+
+FILTER_OPTION_FACETS = {
+    f'{field}_options': distinct_values_facet(field)
+    for field in FILTER_OPTION_FIELDS.values()
+}
+
+REGION_COUNT_FACETS = {
+    'region_deal_counts': [
+        {'$group': {'_id': {'$toLower': {'$ifNull': ['$region', '']}}, 'count': {'$sum': 1}}}
+    ]
+}
+
+def combine_facets(*groups: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Merge facet groups into one $facet stage, refusing groups that share a branch name"""
+    combined: Dict[str, List[Dict[str, Any]]] = {}
+    for group in groups:
+        shared = combined.keys() & group.keys()
+        if shared:
+            raise ValueError(f"Facet branches defined twice: {', '.join(sorted(shared))}")
+        combined.update(group)
+    return combined
+
+DEAL_ANALYTICS_FACETS = combine_facets(PIPELINE_FACETS, AE_PERFORMANCE_FACETS, REGIONAL_FACETS)
+ANALYTICS_SNAPSHOT_FACETS = combine_facets(DEAL_ANALYTICS_FACETS, FILTER_OPTION_FACETS, REGION_COUNT_FACETS)
+
+async def aggregate_facets(facets: Dict[str, List[Dict[str, Any]]], match: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Run several $facet branches over the matching deals in a single pass"""
+    result = await db.deals.aggregate([{'$match': match or {}}, {'$facet': facets}]).to_list(1)
+    return result[0] if result else {name: [] for name in facets}
+
+def shape_pipeline_metrics(facets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Overall pipeline totals, win rate and per-stage breakdown from the PIPELINE_FACETS rows"""
+    if not facets['totals']:
+        return {
+            'total_deals': 0,
+            'total_value': 0,
+            'avg_deal_size': 0,
+            'win_rate': 0,
+            'stages': {}
+        }
+    
+    totals = facets['totals'][0]
+    total_deals = totals['total_deals']
+    total_value = totals['total_value']
+    avg_deal_size = total_value / total_deals if total_deals > 0 else 0
+    
+    # Win rate
+    won_deals = totals['won_deals']
+    closed_deals = totals['closed_deals']
+    win_rate = (won_deals / closed_deals * 100) if closed_deals > 0 else 0
+    
+    # Stage breakdown
+    stage_metrics = {
+        row['_id']: {'count': row['count'], 'value': row['value']}
+        for row in facets['stages']
+    }
+    
+    return {
+        'total_deals': total_deals,
+        'total_value': round(total_value, 2),
+        'avg_deal_size': round(avg_deal_size, 2),
+        'win_rate': round(win_rate, 2),
+        'stages': stage_metrics
+    }
+
+def shape_ae_performance(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-AE totals and conversion rate from the AE_PERFORMANCE_FACETS rows"""
+    ae_metrics = []
+    
+    # Calculate derived metrics
+    for row in rows:
+        ae_metrics.append({
+            'ae_name': row['_id'],
+            'total_deals': row['total_deals'],
+            'total_value': round(row['total_value'], 2),
+            'won_deals': row['won_deals'],
+            'total_closed': row['total_closed'],
+            'avg_deal_size': round(
+                row['total_value'] / row['total_deals'] if row['total_deals'] > 0 else 0,
+                2
+            ),
+            'conversion_rate': round(
+                row['won_deals'] / row['total_closed'] * 100 if row['total_closed'] > 0 else 0,
+                2
+            )
+        })
+    
+    return ae_metrics
+
+def shape_regional_metrics(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-region totals from the REGIONAL_FACETS rows"""
+    region_metrics = []
+    
+    # Calculate avg deal size
+    for row in rows:
+        region_metrics.append({
+            'region': row['_id'],
+            'total_deals': row['total_deals'],
+            'total_value': round(row['total_value'], 2),
+            'avg_deal_size': round(
+                row['total_value'] / row['total_deals'] if row['total_deals'] > 0 else 0,
+                2
+            )
+        })
+    
+    return region_metrics
+
+def shape_pivot_row(keys: Dict[str, Any], deals: int, value: float, won_deals: int, closed_deals: int) -> Dict[str, Any]:
+    """One pivot cell: its grouping values plus deal count, value, average size and win rate"""
+    return {
+        **keys,
+        'deals': deals,
+        'value': round(value, 2),
+        'avg_deal_size': round(value / deals if deals > 0 else 0, 2),
+        'won_deals': won_deals,
+        'closed_deals': closed_deals,
+        'win_rate': round(won_deals / closed_deals * 100 if closed_deals > 0 else 0, 2)
+    }
+
+def shape_filter_options(facets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[str]]:
+    return {
+        key: [row['_id'] for row in facets.get(f'{field}_options', [])]
+        for key, field in FILTER_OPTION_FIELDS.items()
+    }
+
+async def compute_filter_options() -> Dict[str, List[str]]:
+    """Collect sorted distinct values for each dashboard filter"""
+    return shape_filter_options(await aggregate_facets(FILTER_OPTION_FACETS))
+
+async def compute_region_deal_counts(match: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """Count deals per lowercased region (used by the lead funnel)"""
+    facets = await aggregate_facets(REGION_COUNT_FACETS, match)
+    return {row['_id']: row['count'] for row in facets['region_deal_counts']}
+
+async def compute_deal_analytics(match: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Pipeline, AE and regional analytics of the matching deals in a single pass"""
+    facets = await aggregate_facets(DEAL_ANALYTICS_FACETS, match)
+    return {
+        'pipeline': shape_pipeline_metrics(facets),
+        'ae_performance': shape_ae_performance(facets['ae_performance']),
+        'regional_metrics': shape_regional_metrics(facets['regional_metrics'])
+    }
+
+async def build_analytics_snapshot(content_hash: str) -> Dict[str, Any]:
+    """Materialize all dashboard analytics for the current deals into one document"""
+    # Every section comes out of one pass over the deals
+    facets = await aggregate_facets(ANALYTICS_SNAPSHOT_FACETS)
+    
+    snapshot = {
+        'id': str(uuid.uuid4()),
+        'version': ANALYTICS_SNAPSHOT_VERSION,
+        'content_hash': content_hash,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'pipeline': shape_pipeline_metrics(facets),
+        'ae_performance': shape_ae_performance(facets['ae_performance']),
+        'regional_metrics': shape_regional_metrics(facets['regional_metrics']),
+        'filters': shape_filter_options(facets),
+        'region_deal_counts': {row['_id']: row['count'] for row in facets['region_deal_counts']}
+    }
+    
+    # Replace any snapshot for the same content, then drop older generations
+    await db.analytics_snapshots.replace_one(
+        {'content_hash': content_hash, 'version': ANALYTICS_SNAPSHOT_VERSION},
+        snapshot,
+        upsert=True
+    )
+    await db.analytics_snapshots.delete_many({
+        '$or': [
+            {'content_hash': {'$ne': content_hash}},
+            {'version': {'$ne': ANALYTICS_SNAPSHOT_VERSION}}
+        ]
+    })
+    sync_logger.debug("Stored analytics snapshot v%d for content %s", ANALYTICS_SNAPSHOT_VERSION, content_hash)
+    return snapshot
+
+async def get_analytics_snapshot() -> Optional[Dict[str, Any]]:
+    """Load the snapshot of the currently synced content, or None if there is none.
+
+    After a failed or cancelled sync the stored hash is cleared while the deals
+    may have partly changed, so no snapshot matches and callers aggregate live.
+    """
+    sync_meta = await db.sync_metadata.find_one({}, {'_id': 0, 'content_hash': 1})
+    content_hash = sync_meta.get('content_hash') if sync_meta else None
+    snapshot = await db.analytics_snapshots.find_one(
+        {'version': ANALYTICS_SNAPSHOT_VERSION, 'content_hash': content_hash},
+        {'_id': 0}
+    ) if content_hash else None
+    CACHE_REQUESTS.inc(cache='analytics_snapshot', result='hit' if snapshot else 'miss')
+    return snapshot
+
+
+# In-memory columnar copy of the deals, answering the analytics and deal counts without
+# a MongoDB aggregation. Dimensions are dictionary-encoded; group-bys are bincounts.
+DEAL_COLUMN_DIMENSIONS = ('ae', 'region', 'stage', 'industry', 'lead_source', 'confidence')
+# What /analytics/pivot can group by: the column dimensions plus the create date bucket
+PIVOT_DIMENSIONS = (*DEAL_COLUMN_DIMENSIONS, 'date')
+DEAL_DATE_COMPARISONS = {
+    '$gte': np.greater_equal,
+    '$gt': np.greater,
+    '$lte': np.less_equal,
+    '$lt': np.less
+}
+
+def to_datetime64(value) -> np.datetime64:
+    """A stored or filter datetime as naive-UTC datetime64, NaT for anything else"""
+    if not isinstance(value, datetime):
+        return np.datetime64('NaT', 'ms')
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, 'ms')
+
+def match_columns(query: Dict[str, Any], values: Dict[str, List[Any]], codes: Dict[str, np.ndarray], dates: np.ndarray) -> Optional[np.ndarray]:
+    """Rows of dictionary-encoded columns matching a deal_filter_query filter, or None if it uses anything else"""
+    mask = np.ones(len(dates), dtype=bool)
+    for field, condition in query.items():
+        if field == 'date':
+            for operator, bound in condition.items():
+                compare = DEAL_DATE_COMPARISONS.get(operator)
+                if compare is None:
+                    return None
+                # Deals without a date never match a range, as in MongoDB
+                mask &= compare(dates, to_datetime64(bound))
+        elif field in codes:
+            if isinstance(condition, dict):
+                if condition.keys() != {'$in'}:
+                    return None
+                wanted = set(condition['$in'])
+            else:
+                wanted = {condition}
+            matching = [code for code, value in enumerate(values[field]) if value in wanted]
+            mask &= np.isin(codes[field], matching)
+        else:
+            return None
+    return mask
+
+def day_aligned(query: Dict[str, Any]) -> bool:
+    """Whether a filter's date range starts and ends on UTC midnights, so whole days either match or not"""
+    for operator, bound in query.get('date', {}).items():
+        if operator not in ('$gte', '$lt') or to_datetime64(bound) != to_datetime64(bound).astype('datetime64[D]'):
+            return False
+    return True
+
+def group_measures(keys: np.ndarray, sizes: List[int], measures: List[np.ndarray]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Distinct rows of the code matrix ``keys`` and the summed measures of each.
+
+    ``sizes`` bounds the codes of each column, so a row packs into one int64
+    and grouping is a 1-d unique instead of a row-wise one.
+    """
+    if not keys.shape[1]:
+        # No grouping: everything rolls up into one row
+        groups = np.zeros((1 if len(keys) else 0, 0), dtype=np.int32)
+        return groups, [np.array([measure.sum()]) if len(keys) else measure[:0] for measure in measures]
+
+    radix = np.cumprod([1, *sizes[:0:-1]])[::-1].astype(np.int64)
+    if np.prod(np.array(sizes, dtype=np.float64)) < 2 ** 62:
+        packed, inverse = np.unique(keys.astype(np.int64) @ radix, return_inverse=True)
+        groups = (packed[:, None] // radix) % np.array(sizes, dtype=np.int64)
+    else:
+        groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    return groups, [np.bincount(inverse, weights=measure, minlength=len(groups)) for measure in measures]
+
+class DealColumns:
+    """The deals of one content hash as columns, plus their pivot cube.
+
+    Each dimension is an int32 code array indexing the list of its distinct
+    values (None included), next to float64 values and datetime64 dates.
+    The cube holds one cell per distinct combination of every dimension and
+    the day, with its deal count, value, won and closed counts; pivots roll
+    cells up instead of rescanning deals. Instances are never modified, so
+    a reload swaps in a new one while running requests keep reading the old.
+    """
+
+    def __init__(self, content_hash: str, codes: Dict[str, List[int]], values: Dict[str, List[Any]], amounts: List[float], dates: List[np.datetime64]):
+        self.content_hash = content_hash
+        self.size = len(amounts)
+        self.values = values
+        self.codes = {field: np.array(codes[field], dtype=np.int32) for field in DEAL_COLUMN_DIMENSIONS}
+        self.amounts = np.array(amounts, dtype=np.float64)
+        self.dates = np.array(dates, dtype='datetime64[ms]')
+
+        # Won/closed per stage value, mirroring WON_DEAL_EXPR and CLOSED_DEAL_EXPR
+        stages = ['' if stage is None else str(stage).lower() for stage in values['stage']]
+        self.won = np.array([stage in WON_STAGES for stage in stages], dtype=bool)[self.codes['stage']]
+        self.closed = np.array([stage in WON_STAGES + LOST_STAGES for stage in stages], dtype=bool)[self.codes['stage']]
+
+        # Days (NaT for undated deals) and, per granularity, the bucket of each day
+        self.days, day_codes = np.unique(self.dates.astype('datetime64[D]'), return_inverse=True)
+        self.day_codes = day_codes.reshape(-1).astype(np.int32)
+        day_starts = [None if np.isnat(day) else day.astype(datetime).replace(tzinfo=timezone.utc) for day in self.days.astype('datetime64[us]')]
+        self.day_buckets: Dict[str, Tuple[List[Optional[datetime]], np.ndarray]] = {}
+        for granularity in TREND_GRANULARITIES:
+            buckets: Dict[Optional[datetime], int] = {}
+            bucket_codes = [buckets.setdefault(day and trend_bucket(day, granularity), len(buckets)) for day in day_starts]
+            self.day_buckets[granularity] = (list(buckets), np.array(bucket_codes, dtype=np.int32))
+
+        # The base cuboid: every other grouping is a roll-up of these cells
+        keys = np.stack([self.codes[field] for field in DEAL_COLUMN_DIMENSIONS] + [self.day_codes], axis=1)
+        sizes = [max(1, len(self.values[field])) for field in DEAL_COLUMN_DIMENSIONS] + [max(1, len(self.days))]
+        self.cells, self.cell_measures = group_measures(
+            keys, sizes, [np.ones(self.size), self.amounts, self.won.astype(np.float64), self.closed.astype(np.float64)]
+        )
+        self.cell_dates = self.days[self.cells[:, -1]].astype('datetime64[ms]') if len(self.cells) else np.array([], dtype='datetime64[ms]')
+
+    @classmethod
+    async def load(cls, content_hash: str) -> 'DealColumns':
+        """Scan the deals collection once into columns"""
+        codes = {field: [] for field in DEAL_COLUMN_DIMENSIONS}
+        dictionaries = {field: {} for field in DEAL_COLUMN_DIMENSIONS}
+        amounts = []
+        dates = []
+        projection = {'_id': 0, 'potential_size': 1, 'date': 1, **{field: 1 for field in DEAL_COLUMN_DIMENSIONS}}
+        async for deal in db.deals.find({}, projection, batch_size=DEAL_WRITE_BATCH_SIZE):
+            for field in DEAL_COLUMN_DIMENSIONS:
+                dictionary = dictionaries[field]
+                codes[field].append(dictionary.setdefault(deal.get(field), len(dictionary)))
+            value = deal.get('potential_size')
+            # Like DEAL_VALUE_EXPR: missing values count as 0, non-numbers are ignored by $sum
+            amounts.append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0.0)
+            dates.append(to_datetime64(deal.get('date')))
+
+        values = {field: list(dictionaries[field]) for field in DEAL_COLUMN_DIMENSIONS}
+        return cls(content_hash, codes, values, amounts, dates)
+
+    def mask(self, query: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Rows matching a deal_filter_query filter, or None if it uses anything else"""
+        return match_columns(query, self.values, self.codes, self.dates)
+
+    def pivot(self, by: List[str], granularity: str, query: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Pivot rows grouped by the PIVOT_DIMENSIONS in ``by``, or None if the filter is unsupported.
+
+        Rolled up from the cube cells; a date range that splits days is
+        evaluated on the deals themselves instead.
+        """
+        if day_aligned(query):
+            columns = {field: self.cells[:, position] for position, field in enumerate(DEAL_COLUMN_DIMENSIONS)}
+            day_codes = self.cells[:, -1]
+            mask = match_columns(query, self.values, columns, self.cell_dates)
+            measures = self.cell_measures
+        else:
+            columns = self.codes
+            day_codes = self.day_codes
+            mask = self.mask(query)
+            measures = [np.ones(self.size), self.amounts, self.won.astype(np.float64), self.closed.astype(np.float64)]
+        if mask is None:
+            return None
+
+        dictionaries = []
+        selected = []
+        for field in by:
+            if field == 'date':
+                buckets, bucket_codes = self.day_buckets[granularity]
+                dictionaries.append(buckets)
+                selected.append(bucket_codes[day_codes[mask]])
+            else:
+                dictionaries.append(self.values[field])
+                selected.append(columns[field][mask])
+        keys = np.stack(selected, axis=1) if selected else np.zeros((int(mask.sum()), 0), dtype=np.int32)
+
+        sizes = [max(1, len(dictionary)) for dictionary in dictionaries]
+        groups, (deals, amounts, won, closed) = group_measures(keys, sizes, [measure[mask] for measure in measures])
+        # Plain Python values out of the arrays in bulk; per-element numpy access is far slower
+        return [
+            shape_pivot_row(
+                {field: dictionary[code] for field, dictionary, code in zip(by, dictionaries, group)},
+                int(row_deals), row_amount, int(row_won), int(row_closed)
+            )
+            for group, row_deals, row_amount, row_won, row_closed in zip(
+                groups.tolist(), deals.tolist(), amounts.tolist(), won.tolist(), closed.tolist()
+            )
+        ]
+
+    def group(self, field: str, mask: np.ndarray) -> List[Dict[str, Any]]:
+        """Deal count, value, won and closed counts per value of ``field`` among the masked rows"""
+        codes = self.codes[field][mask]
+        size = len(self.values[field])
+        counts = np.bincount(codes, minlength=size)
+        amounts = np.bincount(codes, weights=self.amounts[mask], minlength=size)
+        won = np.bincount(codes, weights=self.won[mask], minlength=size)
+        closed = np.bincount(codes, weights=self.closed[mask], minlength=size)
+        return [
+            {'_id': self.values[field][code], 'total_deals': int(counts[code]), 'total_value': float(amounts[code]),
+             'won_deals': int(won[code]), 'total_closed': int(closed[code])}
+            for code in np.flatnonzero(counts)
+        ]
+
+    def facets(self, mask: np.ndarray) -> Dict[str, List[Dict[str, Any]]]:
+        """The rows aggregate_facets would return for the pipeline, AE and regional facets"""
+        total_deals = int(mask.sum())
+        totals = [{
+            'total_deals': total_deals,
+            'total_value': float(self.amounts[mask].sum()),
+            'won_deals': int(self.won[mask].sum()),
+            'closed_deals': int(self.closed[mask].sum())
+        }] if total_deals else []
+
+        # Stages group on $ifNull, so a missing stage and a literal 'Unknown' share a row
+        stages: Dict[Any, Dict[str, Any]] = {}
+        for row in self.group('stage', mask):
+            stage = stages.setdefault('Unknown' if row['_id'] is None else row['_id'], {'count': 0, 'value': 0.0})
+            stage['count'] += row['total_deals']
+            stage['value'] += row['total_value']
+
+        return {
+            'totals': totals,
+            'stages': [{'_id': stage, **metrics} for stage, metrics in stages.items()],
+            'ae_performance': [row for row in self.group('ae', mask) if row['_id'] not in (None, '')],
+            'regional_metrics': [row for row in self.group('region', mask) if row['_id'] not in (None, '')]
+        }
+
+    def deal_analytics(self, mask: np.ndarray) -> Dict[str, Any]:
+        """Same result as compute_deal_analytics for the masked rows"""
+        facets = self.facets(mask)
+        return {
+            'pipeline': shape_pipeline_metrics(facets),
+            'ae_performance': shape_ae_performance(facets['ae_performance']),
+            'regional_metrics': shape_regional_metrics(facets['regional_metrics'])
+        }
+
+    def region_deal_counts(self, mask: np.ndarray) -> Dict[str, int]:
+        """Same result as compute_region_deal_counts for the masked rows"""
+        counts: Dict[str, int] = defaultdict(int)
+        for row in self.group('region', mask):
+            counts['' if row['_id'] is None else str(row['_id']).lower()] += row['total_deals']
+        return dict(counts)
+
+    def filter_options(self) -> Dict[str, List[str]]:
+        """Same result as compute_filter_options"""
+        return {
+            key: sorted(value for value in self.values[field] if value not in (None, ''))
+            for key, field in FILTER_OPTION_FIELDS.items()
+        }
+
+class DealStore:
+    """This worker's DealColumns, reloaded when the synced content hash changes"""
+
+    def __init__(self):
+        self.columns: Optional[DealColumns] = None
+
+    async def get(self, content_hash: str) -> DealColumns:
+        columns = self.columns
+        if columns is not None and columns.content_hash == content_hash:
+            return columns
+        return await single_flight(f"deal-columns:{content_hash}", lambda: self.load(content_hash))
+
+    async def load(self, content_hash: str) -> DealColumns:
+        started = time.perf_counter()
+        columns = await DealColumns.load(content_hash)
+        # One reference swap; requests already holding the old columns finish with them
+        self.columns = columns
+        # The sync summary already times its 'columns' phase
+        logger.debug("Loaded %d deals into columns for content %s in %.3fs", columns.size, content_hash, time.perf_counter() - started)
+        return columns
+
+deal_store = DealStore()
+
+async def current_deal_columns() -> Optional[DealColumns]:
+    """Columns of the currently synced deals, or None if there is no successful sync to serve"""
+    sync_meta = await db.sync_metadata.find_one({}, {'_id': 0, 'content_hash': 1})
+    if not sync_meta or not sync_meta.get('content_hash'):
+        return None
+    return await deal_store.get(sync_meta['content_hash'])
+
+
+# Concurrent callers of the same operation share one in-flight task
+_inflight_tasks: Dict[str, asyncio.Task] = {}
+
+async def single_flight(key: str, coro_factory):
+    """Run ``coro_factory()`` once for all concurrent callers using the same key"""
+    task = _inflight_tasks.get(key)
+    if task is None:
+        task = asyncio.ensure_future(coro_factory())
+        _inflight_tasks[key] = task
+        task.add_done_callback(lambda _: _inflight_tasks.pop(key, None))
+
+    # Shielded so one caller disconnecting does not cancel the shared work
+    return await asyncio.shield(task)
+
+# One sync at a time: an in-process lock, plus a MongoDB lease across workers
+sync_lock = asyncio.Lock()
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+SYNC_LEASE_ID = 'sheets-sync'
+
+async def acquire_sync_lease() -> bool:
+    """Take (or renew) the cross-worker sync lease; False if another worker holds it"""
+    now = datetime.now(timezone.utc)
     try:
-        result = await fetch_raw_data()
-        if result[0] is None:
-            raise HTTPException(status_code=500, detail="Failed to fetch sheet data. Please ensure the Google Sheet is publicly accessible.")
+        await db.sync_leases.update_one(
+            {'_id': SYNC_LEASE_ID, '$or': [{'expires_at': {'$lt': now}}, {'owner': WORKER_ID}]},
+            {'$set': {'owner': WORKER_ID, 'expires_at': now + timedelta(seconds=SYNC_LEASE_SECONDS)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # The lease document exists and is held by a live owner
+        return False
+
+async def renew_sync_lease(lease: SyncLease):
+    """Keep the lease alive while a long sync runs; flag it lost if another worker took it over"""
+    while True:
+        await asyncio.sleep(SYNC_LEASE_SECONDS / 3)
+        try:
+            renewed = await acquire_sync_lease()
+        except Exception as e:
+            # Retried on the next tick, well before the lease expires
+            sync_logger.warning("Could not renew the sync lease: %s", e)
+            continue
+        if not renewed:
+            # The sync stops at its next safe point instead of writing alongside the new holder
+            sync_logger.error("Sync lease was taken over by another worker; cancelling the running sync")
+            lease.lost = True
+            return
+
+async def release_sync_lease():
+    await db.sync_leases.delete_one({'_id': SYNC_LEASE_ID, 'owner': WORKER_ID})
+
+@asynccontextmanager
+async def exclusive_sync():
+    """Hold the process lock and the cross-worker lease for the duration of a sync"""
+    async with sync_lock:
+        if not await acquire_sync_lease():
+            raise HTTPException(status_code=409, detail="A sync is already running on another worker")
+
+        lease = SyncLease()
+        lease_token = current_sync_lease.set(lease)
+        renewer = asyncio.create_task(renew_sync_lease(lease))
+        try:
+            yield
+        finally:
+            renewer.cancel()
+            current_sync_lease.reset(lease_token)
+            await release_sync_lease()
+
+async def sync_lease_holder() -> Optional[str]:
+    """The other worker currently holding the sync lease, if any"""
+    lease = await db.sync_leases.find_one({'_id': SYNC_LEASE_ID})
+    if lease and lease['owner'] != WORKER_ID and lease['expires_at'].replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
+        return lease['owner']
+    return None
+
+SYNC_JOB_ACTIVE = ('queued', 'running')
+
+class SyncJob:
+    """One sync run, tracked from being queued until it succeeds, fails or is cancelled.
+
+    The job document is saved to ``sync_jobs`` as the job changes and every
+    SYNC_JOB_PROGRESS_SECONDS while it runs, so any worker can report it.
+    Cancellation requested through another worker reaches the job through
+    the ``cancel_requested`` flag on that document.
+    """
+
+    def __init__(self, full: bool, trigger: str):
+        self.id = str(uuid.uuid4())
+        self.full = full
+        self.trigger = trigger
+        self.status = 'queued'
+        self.progress = SyncProgress()
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.started = None
+        self.seconds: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def document(self) -> Dict[str, Any]:
+        progress = self.progress
+        seconds = self.seconds if self.seconds is not None else (time.perf_counter() - self.started if self.started else None)
+        return {
+            'id': self.id,
+            'trigger': self.trigger,
+            'full': self.full,
+            'status': self.status,
+            'phase': progress.phase,
+            'worker': WORKER_ID,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration_seconds': seconds and round(seconds, 3),
+            'rows_parsed': progress.rows,
+            'deals_written': progress.deals_written,
+            'bytes_downloaded': sum(progress.downloaded_bytes.values()),
+            'rows_per_second': round(progress.rows / seconds) if seconds else None,
+            'parse_rows_per_second': progress.parse_rows_per_second,
+            'phase_seconds': dict(progress.phase_seconds),
+            'cancel_requested': progress.cancel_requested,
+            'result': self.result,
+            'error': self.error,
+            'status_code': self.status_code
+        }
 
-        values, raw_content = result
+    def request_cancel(self):
+        """Cancel a queued job outright; stop a running one at its next safe point"""
+        if self.status == 'queued' and self.task is not None:
+            self.task.cancel()
+        self.progress.cancel_requested = True
+
+    async def save(self):
+        # cancel_requested is left alone so a request made through another worker is not overwritten
+        document = self.document()
+        document.pop('cancel_requested')
+        await db.sync_jobs.update_one({'id': self.id}, {'$set': document}, upsert=True)
+
+    async def report_progress(self):
+        """Save progress periodically and pick up cancellation requested elsewhere"""
+        while True:
+            await asyncio.sleep(SYNC_JOB_PROGRESS_SECONDS)
+            try:
+                await self.save()
+                stored = await db.sync_jobs.find_one({'id': self.id}, {'_id': 0, 'cancel_requested': 1})
+                if stored and stored.get('cancel_requested'):
+                    self.request_cancel()
+            except Exception as e:
+                sync_logger.warning("Could not save progress of sync job %s: %s", self.id, e)
+
+    async def finish(self, status: str, error: Optional[str] = None, status_code: Optional[int] = None):
+        self.status = status
+        self.error = error
+        self.status_code = status_code
+        self.finished_at = datetime.now(timezone.utc).isoformat()
+        if self.started is not None:
+            self.seconds = time.perf_counter() - self.started
+        await self.save()
+        await prune_sync_jobs()
+
+    async def run(self, prefetched: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run the sync; the caller holds the sync lock"""
+        self.status = 'running'
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        await self.save()
+
+        reporter = asyncio.create_task(self.report_progress())
+        try:
+            self.result = await run_sync(full=self.full, prefetched=prefetched, progress=self.progress)
+        except SyncCancelled as e:
+            await self.finish('cancelled', str(e))
+            raise
+        except HTTPException as e:
+            await self.finish('failed', e.detail, e.status_code)
+            raise
+        except asyncio.CancelledError:
+            await self.finish('cancelled', "Sync interrupted")
+            raise
+        except Exception as e:
+            await self.finish('failed', str(e), 500)
+            raise
+        finally:
+            reporter.cancel()
+
+        await self.finish('succeeded')
+        return self.result
+
+# Jobs started by this worker, oldest first
+sync_jobs: Dict[str, SyncJob] = {}
+
+def create_sync_job(full: bool, trigger: str) -> SyncJob:
+    job = SyncJob(full, trigger)
+    sync_jobs[job.id] = job
+    # Forget the oldest finished jobs; their documents stay in sync_jobs
+    finished = [job_id for job_id, tracked in sync_jobs.items() if tracked.status not in SYNC_JOB_ACTIVE]
+    for job_id in finished[:max(0, len(sync_jobs) - SYNC_JOB_HISTORY)]:
+        del sync_jobs[job_id]
+    return job
+
+async def prune_sync_jobs():
+    """Keep only the newest SYNC_JOB_HISTORY job documents"""
+    try:
+        oldest_kept = await db.sync_jobs.find({}, {'_id': 0, 'created_at': 1}).sort('created_at', DESCENDING).skip(max(0, SYNC_JOB_HISTORY - 1)).to_list(1)
+        if oldest_kept:
+            await db.sync_jobs.delete_many({'created_at': {'$lt': oldest_kept[0]['created_at']}, 'status': {'$nin': list(SYNC_JOB_ACTIVE)}})
+    except Exception as e:
+        sync_logger.warning("Could not prune sync job history: %s", e)
+
+async def execute_sync_job(job: SyncJob):
+    """Background task of a manually started job: wait for the sync lock, then run it"""
+    try:
+        async with exclusive_sync():
+            # Cancelled while waiting for the lock, possibly through another worker
+            stored = await db.sync_jobs.find_one({'id': job.id}, {'_id': 0, 'cancel_requested': 1})
+            if job.progress.cancel_requested or (stored and stored.get('cancel_requested')):
+                await job.finish('cancelled', "Sync cancelled before it started")
+                return
+            await job.run()
+    except asyncio.CancelledError:
+        if job.status == 'queued':
+            await job.finish('cancelled', "Sync cancelled before it started")
+    except HTTPException as e:
+        # A job that ran has recorded its own outcome
+        if job.status == 'queued':
+            await job.finish('failed', e.detail, e.status_code)
+    except Exception as e:
+        if job.status == 'queued':
+            await job.finish('failed', str(e), 500)
 
-        deals = parse_raw_data(values)
+async def start_sync_job(full: bool) -> SyncJob:
+    """Queue a manual sync, or return the active job that already covers it"""
+    for job in sync_jobs.values():
+        if job.status in SYNC_JOB_ACTIVE and not job.progress.cancel_requested and (job.full or not full):
+            return job
 
-        if not deals:
-            raise HTTPException(status_code=400, detail="No valid deal data found in the sheet")
+    if await sync_lease_holder():
+        raise HTTPException(status_code=409, detail="A sync is already running on another worker")
 
-        # Compute content hash for change detection
-        content_hash = compute_content_hash(raw_content)
+    job = create_sync_job(full, 'manual')
+    await job.save()
+    job.task = asyncio.create_task(execute_sync_job(job))
+    return job
 
-        # Clear existing deals and insert new ones
-        await db.deals.delete_many({})
+@api_router.post("/sheets/sync")
+async def sync_sheets(full: bool = False, wait: bool = False):
+    """Start a sync of Google Sheets into MongoDB and return its job (202).
+
+    Poll GET /sheets/jobs/{id} for progress. With ``wait`` the call instead
+    blocks until the sync finished and returns its result.
+    """
+    job = await start_sync_job(full)
+    if not wait:
+        return JSONResponse(status_code=202, content=job.document())
+
+    # Jobs started by the scheduler have no task of their own to await
+    while job.status in SYNC_JOB_ACTIVE:
+        if job.task is not None:
+            await asyncio.shield(job.task)
+        else:
+            await asyncio.sleep(SYNC_JOB_PROGRESS_SECONDS)
+    if job.status != 'succeeded':
+        raise HTTPException(status_code=job.status_code or 409, detail=job.error)
+    return job.result
+
+async def load_sync_job(job_id: str) -> Dict[str, Any]:
+    """A job's current document, from this worker if it runs the job, else as last saved"""
+    job = sync_jobs.get(job_id)
+    if job is not None:
+        return job.document()
+    document = await db.sync_jobs.find_one({'id': job_id}, {'_id': 0})
+    if document is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return document
+
+@api_router.get("/sheets/jobs")
+async def list_sync_jobs(limit: int = Query(20, ge=1, le=100)):
+    """Most recent sync jobs, newest first"""
+    documents = await db.sync_jobs.find({}, {'_id': 0}).sort('created_at', DESCENDING).limit(limit).to_list(limit)
+    # Jobs running here report live progress rather than their last save
+    return [sync_jobs[doc['id']].document() if doc['id'] in sync_jobs else doc for doc in documents]
+
+@api_router.get("/sheets/jobs/{job_id}")
+async def get_sync_job(job_id: str):
+    """Phase, progress and outcome of a sync job"""
+    return await load_sync_job(job_id)
+
+@api_router.post("/sheets/jobs/{job_id}/cancel", status_code=202)
+async def cancel_sync_job(job_id: str):
+    """Request cancellation of a queued or running sync job.
+
+    A running job stops before its next write batch; once it has started
+    committing it runs to completion.
+    """
+    job = sync_jobs.get(job_id)
+    if job is not None:
+        if job.status not in SYNC_JOB_ACTIVE:
+            raise HTTPException(status_code=409, detail=f"Sync job already {job.status}")
+        job.request_cancel()
+        await db.sync_jobs.update_one({'id': job_id}, {'$set': {'cancel_requested': True}})
+        return job.document()
+
+    # Running on another worker, which picks the flag up with its next progress save
+    result = await db.sync_jobs.update_one(
+        {'id': job_id, 'status': {'$in': list(SYNC_JOB_ACTIVE)}},
+        {'$set': {'cancel_requested': True}}
+    )
+    document = await load_sync_job(job_id)
+    if not result.matched_count:
+        raise HTTPException(status_code=409, detail=f"Sync job already {document['status']}")
+    return document
+
+async def sync_deals(full: bool, prefetched: Optional[Dict[str, Any]]) -> Tuple[int, str, Dict[str, Optional[str]], Dict[str, Any]]:
+    """Stream the Raw Data tab into the deals collection.
+
+    Only the rows that changed since the last sync are written, or the
+    collection is reloaded blue/green when ``full`` is set. Returns (deals
+    parsed, content hash, source validators, change counts).
+    """
+    writer = await open_deal_writer(force_full=full)
+    try:
+        deal_count, content_hash, validators = await stream_raw_data(writer, prefetched)
 
-        # Convert deals to documents
-        deal_docs = [{**deal, 'created_at': deal['created_at']} for deal in deals]
-        await db.deals.insert_many(deal_docs)
+        if not deal_count:
+            raise HTTPException(status_code=400, detail="No valid deal data found in the sheet")
+
+        # Last point a cancellation is honoured; a commit runs to completion
+        progress = current_sync_progress.get()
+        if progress is not None:
+            progress.check_cancelled()
+        with sync_phase('commit'):
+            changes = await writer.commit()
+    except BaseException:
+        # Also on task cancellation (shutdown, a cancelled job task): the rollup
+        # and history deltas of written batches must land, shielded from a
+        # second cancellation, or those deals would diff as unchanged forever
+        await asyncio.shield(writer.abort())
+        raise
 
-        # Fetch and sync MQL/SQL data from the second sheet
-        sheet_2_values = await fetch_sheet_2_data()
+    return deal_count, content_hash, validators, changes
+
+async def record_failed_sync(status: str, error: str):
+    """Replace the sync metadata after a sync that did not finish.
+
+    No content hash is stored, so the next change check syncs again and
+    cached responses are bypassed until it has.
+    """
+    sync_meta = {
+        'id': str(uuid.uuid4()),
+        'last_sync': datetime.now(timezone.utc).isoformat(),
+        'status': status,
+        'records_synced': 0,
+        'changed_sections': ['sync_status'],
+        'error': error
+    }
+    await db.sync_metadata.delete_many({})
+    await db.sync_metadata.insert_one(sync_meta)
+    events.publish_sync(sync_meta)
+
+async def run_sync(full: bool = False, prefetched: Optional[Dict[str, Any]] = None, progress: Optional[SyncProgress] = None):
+    """Sync deals and MQL/SQL data, optionally reusing a Raw Data body already downloaded.
+
+    ``progress`` is updated as the sync runs; setting its ``cancel_requested``
+    stops the sync at the next safe point with SyncCancelled.
+    """
+    started = time.perf_counter()
+    mode = 'full' if full else 'auto'
+    progress = progress or SyncProgress()
+    progress_token = current_sync_progress.set(progress)
+    try:
+        # Both sheets are downloaded concurrently over the shared session
+        (deal_count, content_hash, validators, changes), sheet_2_values = await asyncio.gather(
+            sync_deals(full, prefetched),
+            fetch_sheet_2_data()
+        )
+
+        mode = 'full' if changes['full_resync'] else 'incremental'
+
+        # Materialize analytics for the new deal set
+        with sync_phase('snapshot'):
+            await build_analytics_snapshot(content_hash)
+        # Other workers load their columns on their next analytics request
+        with sync_phase('columns'):
+            await deal_store.load(content_hash)
+
+        # Sync MQL/SQL data from the second sheet
+        mql_sql_changed = False
         if sheet_2_values:
-            await sync_mql_sql_data(sheet_2_values)
+            with sync_phase('mql_sql'):
+                mql_sql_changed = await sync_mql_sql_data(sheet_2_values)
         else:
-            logger.warning("Could not fetch MQL/SQL data from second sheet")
+            sync_logger.warning("Could not fetch MQL/SQL data from second sheet")
+
+        # What clients showing this data have to refetch
+        changed = {'sync_status'}
+        if changes['full_resync'] or changes['inserted'] or changes['updated'] or changes['deleted']:
+            changed.update(DASHBOARD_DEAL_SECTIONS)
+        if mql_sql_changed:
+            changed.update(DASHBOARD_MQL_SQL_SECTIONS)
 
         # Update sync metadata with content hash
         sync_meta = {
             'id': str(uuid.uuid4()),
             'last_sync': datetime.now(timezone.utc).isoformat(),
             'status': 'success',
-            'records_synced': len(deals),
+            'records_synced': deal_count,
             'content_hash': content_hash,
+            **validators,
+            'changes': changes,
+            'changed_sections': [section for section in DASHBOARD_SECTIONS if section in changed],
             'error': None
         }
 
         await db.sync_metadata.delete_many({})
         await db.sync_metadata.insert_one(sync_meta)
+        events.publish_sync(sync_meta)
+        progress.phase = 'done'
+        log_sync_summary('success', mode, time.perf_counter() - started, {**progress.summary(), 'deals': deal_count, 'changes': changes})
 
         return {
             'status': 'success',
-            'records_synced': len(deals),
+            'records_synced': deal_count,
             'last_sync': sync_meta['last_sync'],
-            'content_hash': content_hash
+            'content_hash': content_hash,
+            'changes': changes
         }
 
-    except HTTPException:
+    except HTTPException as e:
+        log_sync_summary('error', mode, time.perf_counter() - started, {**progress.summary(), 'error': e.detail})
+        raise
+    except SyncCancelled as e:
+        log_sync_summary('cancelled', mode, time.perf_counter() - started, {**progress.summary(), 'error': str(e)})
+        await record_failed_sync('cancelled', str(e))
         raise
     except Exception as e:
-        logger.error(f"Sync error: {e}")
-
-        # Log error in metadata
-        sync_meta = {
-            'id': str(uuid.uuid4()),
-            'last_sync': datetime.now(timezone.utc).isoformat(),
-            'status': 'error',
-            'records_synced': 0,
-            'error': str(e)
-        }
-        await db.sync_metadata.delete_many({})
-        await db.sync_metadata.insert_one(sync_meta)
-
+        log_sync_summary('error', mode, time.perf_counter() - started, {**progress.summary(), 'error': str(e)})
+        await record_failed_sync('error', str(e))
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
 
+    finally:
+        current_sync_progress.reset(progress_token)
+
+def log_sync_summary(status: str, mode: str, seconds: float, summary: Dict[str, Any]):
+    """Record a finished sync: one log record carrying its counts and timings, plus its duration metric"""
+    SYNC_SECONDS.observe(seconds, mode=mode, status=status)
+    fields = {'event': 'sync', 'status': status, 'mode': mode, 'duration_seconds': round(seconds, 3), **summary}
+    if status == 'success':
+        sync_logger.info(
+            "Sync %s (%s) in %.2fs: %s rows, %s deals, changes %s",
+            status, mode, seconds, summary.get('rows'), summary.get('deals'), summary.get('changes'),
+            extra={'fields': fields}
+        )
+    else:
+        level = logging.WARNING if status == 'cancelled' else logging.ERROR
+        sync_logger.log(level, "Sync %s (%s) after %.2fs: %s", status, mode, seconds, summary.get('error'), extra={'fields': fields})
+
+
+# Most recent change check, reused by polls arriving within CHANGE_CHECK_TTL_SECONDS
+_last_change_check: Dict[str, Any] = {}
+
+async def detect_raw_data_changes() -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Check the Raw Data tab against the last sync.
+
+    Sends the validators stored at the last sync as a conditional request, so a
+    source that supports them answers 304 without a body. A changed body is
+    hashed while it is spooled to a temporary file, never held in memory.
+    Returns the check result and, when the sheet changed, the spooled download
+    for the sync to reuse (see claim_change_check_download).
+    """
+    sync_meta = await db.sync_metadata.find_one({}, {'_id': 0}) or {}
+    stored_hash = sync_meta.get('content_hash')
+
+    cached = _last_change_check
+    if (cached and cached['stored_hash'] == stored_hash
+            and time.monotonic() - cached['checked_at'] < CHANGE_CHECK_TTL_SECONDS):
+        CACHE_REQUESTS.inc(cache='change_check', result='hit')
+        return cached['result'], cached['download']
+    CACHE_REQUESTS.inc(cache='change_check', result='miss')
+
+    headers = {}
+    if stored_hash and sync_meta.get('source_etag'):
+        headers['If-None-Match'] = sync_meta['source_etag']
+    if stored_hash and sync_meta.get('source_last_modified'):
+        headers['If-Modified-Since'] = sync_meta['source_last_modified']
+
+    download = None
+    session = get_http_session()
+    started = time.perf_counter()
+    async with session.get(RAW_DATA_CSV_URL, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+        if response.status == 304:
+            record_sheet_download('raw_data', 'change_check', response.status, 0, time.perf_counter() - started)
+            current_hash = stored_hash
+        elif response.status != 200:
+            record_sheet_download('raw_data', 'change_check', response.status, 0, time.perf_counter() - started)
+            return {'has_changes': False, 'error': 'Failed to fetch sheet'}, None
+        else:
+            hasher = hashlib.md5()
+            spool = tempfile.TemporaryFile()
+            size = 0
+            try:
+                async for chunk in response.content.iter_chunked(CSV_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    spool.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                spool.close()
+                raise
+            record_sheet_download('raw_data', 'change_check', response.status, size, time.perf_counter() - started)
+            current_hash = hasher.hexdigest()
+            download = {'spool': spool, 'validators': source_validators(response)}
+
+    has_changes = stored_hash is None or stored_hash != current_hash
+    result = {
+        'has_changes': has_changes,
+        'current_hash': current_hash,
+        'stored_hash': stored_hash
+    }
+    if not has_changes and download is not None:
+        download['spool'].close()
+        download = None
+
+    # A download no sync claimed is superseded by this check
+    previous = _last_change_check.get('download')
+    if previous is not None:
+        previous['spool'].close()
+    _last_change_check.update({
+        'stored_hash': stored_hash,
+        'checked_at': time.monotonic(),
+        'result': result,
+        'download': download
+    })
+    return result, download
+
+def claim_change_check_download(download: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Take a change check's spooled download for a sync, or None if another caller took it.
+
+    Coalesced callers share one check result; the download is handed to one
+    sync only and dropped from the cache, and that sync closes its spool.
+    """
+    if download is None or _last_change_check.get('download') is not download:
+        return None
+    _last_change_check['download'] = None
+    return download
+
 
 @api_router.get("/sheets/check-changes")
 async def check_sheet_changes():
     """Check if sheet data has changed since last sync"""
-    import aiohttp
-
     try:
-        # Get stored hash
-        sync_meta = await db.sync_metadata.find_one({}, {'_id': 0})
-        stored_hash = sync_meta.get('content_hash') if sync_meta else None
+        result, _ = await single_flight('check-changes', detect_raw_data_changes)
+        return result
 
-        # Fetch current sheet content
-        async with aiohttp.ClientSession() as session:
-            async with session.get(RAW_DATA_CSV_URL, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status != 200:
-                    return {'has_changes': False, 'error': 'Failed to fetch sheet'}
+    except Exception as e:
+        sheets_logger.error("Error checking sheet changes: %s", e)
+        return {'has_changes': False, 'error': str(e)}
 
-                content = await response.text()
-                current_hash = compute_content_hash(content)
 
-        has_changes = stored_hash is None or stored_hash != current_hash
+@api_router.post("/sheets/auto-sync")
+async def auto_sync_if_changed(since: Optional[str] = None):
+    """Report whether data was synced after ``since``, waiting for a sync that is running.
+
+    With the background scheduler disabled (SYNC_INTERVAL_SECONDS=0) the call
+    itself checks the sheet and syncs on change, as before.
+    """
+    if SYNC_INTERVAL_SECONDS <= 0:
+        result = await single_flight('auto-sync', locked_auto_sync)
+        if result is not None:
+            return result
+    else:
+        inflight = _inflight_tasks.get('auto-sync')
+        if inflight is not None:
+            # The outcome is read back from sync_metadata below
+            await asyncio.gather(asyncio.shield(inflight), return_exceptions=True)
+
+    sync_meta = await db.sync_metadata.find_one({}, {'_id': 0}) or {}
+    last_sync = sync_meta.get('last_sync')
+
+    if sync_meta.get('status') in ('error', 'cancelled'):
+        return {
+            'synced': False,
+            'reason': 'sync_error',
+            'last_sync': last_sync,
+            'error': sync_meta.get('error')
+        }
 
+    if since and last_sync and last_sync > since:
         return {
-            'has_changes': has_changes,
-            'current_hash': current_hash,
-            'stored_hash': stored_hash
+            'synced': True,
+            'reason': 'changes_detected',
+            'records_synced': sync_meta.get('records_synced', 0),
+            'last_sync': last_sync
         }
 
-    except Exception as e:
-        logger.error(f"Error checking sheet changes: {e}")
-        return {'has_changes': False, 'error': str(e)}
+    return {
+        'synced': False,
+        'reason': 'no_changes',
+        'last_sync': last_sync,
+        'records_count': sync_meta.get('records_synced', 0)
+    }
 
+async def locked_auto_sync() -> Optional[Dict[str, Any]]:
+    """Run auto_sync under the sync lock; None if another worker is already syncing"""
+    try:
+        async with exclusive_sync():
+            return await auto_sync()
+    except HTTPException as e:
+        if e.status_code == 409:
+            return None
+        raise
 
-@api_router.post("/sheets/auto-sync")
-async def auto_sync_if_changed():
-    """Automatically sync if sheet data has changed"""
+async def sync_scheduler():
+    """Poll the sheet in the background and sync whenever it changed"""
+    sync_logger.info("Sync scheduler started on %s (every %ss)", WORKER_ID, SYNC_INTERVAL_SECONDS)
+    while True:
+        try:
+            result = await single_flight('auto-sync', locked_auto_sync)
+            # Completed syncs log their own summary record
+            if result and result.get('error'):
+                sync_logger.warning("Scheduled sync failed: %s", result['error'])
+        except Exception as e:
+            sync_logger.error("Sync scheduler error: %s", e)
+
+        await asyncio.sleep(SYNC_INTERVAL_SECONDS)
+
+async def auto_sync():
+    """Sync only when the Raw Data tab changed, reusing the body fetched by the check"""
     try:
         # Check for changes first
-        change_check = await check_sheet_changes()
+        change_check, download = await single_flight('check-changes', detect_raw_data_changes)
 
         if change_check.get('error'):
             return {
@@ -520,8 +2651,13 @@ async def auto_sync_if_changed():
                 'records_count': sync_meta.get('records_synced', 0) if sync_meta else 0
             }
 
-        # Changes detected, perform sync
-        sync_result = await sync_sheets()
+        # Changes detected, perform sync (the caller holds the sync lock)
+        download = claim_change_check_download(download)
+        try:
+            sync_result = await create_sync_job(full=False, trigger='auto').run(prefetched=download)
+        finally:
+            if download is not None:
+                download['spool'].close()
 
         return {
             'synced': True,
@@ -531,298 +2667,808 @@ async def auto_sync_if_changed():
         }
 
     except Exception as e:
-        logger.error(f"Auto-sync error: {e}")
+        sync_logger.error("Auto-sync error: %s", e)
         return {
             'synced': False,
             'reason': 'sync_error',
             'error': str(e)
         }
 
-@api_router.get("/deals")
-async def get_deals(
-    ae: Optional[str] = None,
-    region: Optional[str] = None,
-    stage: Optional[str] = None,
-    industry: Optional[str] = None,
+def json_default(value):
+    """JSON fallback for values stored in deal documents"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def encode_deals_cursor(sort: str, order: str, deal: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just past ``deal`` in the given ordering"""
+    payload = json.dumps([sort, order, deal.get(sort), deal['id']], default=json_default)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_deals_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, str]:
+    """Return the (sort value, id) a cursor points past, validating it matches the ordering"""
+    try:
+        cursor_sort, cursor_order, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order")
+    if sort in DEAL_DATE_FIELDS and value is not None:
+        value = datetime.fromisoformat(value)
+    return value, last_id
+
+def keyset_filter(sort: str, order: str, value: Any, last_id: str) -> Dict[str, Any]:
+    """Match deals strictly after (value, id) in the given ordering"""
+    op = '$gt' if order == 'asc' else '$lt'
+    if sort == 'id':
+        return {'id': {op: last_id}}
+
+    # MongoDB sorts null (e.g. an unparseable date) before every other value
+    if value is None:
+        if order == 'asc':
+            return {'$or': [{sort: None, 'id': {op: last_id}}, {sort: {'$ne': None}}]}
+        return {sort: None, 'id': {op: last_id}}
+
+    clauses = [
+        {sort: {op: value}},
+        {sort: value, 'id': {op: last_id}}
+    ]
+    if order == 'desc':
+        clauses.append({sort: None})
+    return {'$or': clauses}
+
+async def stream_deals_ndjson(cursor) -> AsyncIterator[str]:
+    """Serialize a deals cursor as newline-delimited JSON, one document at a time"""
+    async for deal in cursor:
+        yield json.dumps(deal, default=json_default) + '\n'
+
+def deal_filter_query(
+    ae: Optional[List[str]] = Query(None),
+    region: Optional[List[str]] = Query(None),
+    stage: Optional[List[str]] = Query(None),
+    industry: Optional[List[str]] = Query(None),
     date_from: Optional[str] = None,
     date_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """Compile the deal filters shared by /deals, /dashboard and the analytics endpoints.
+
+    Used as a dependency. Each dimension may be repeated to match any of
+    several values. Values are normalized (trimmed, deduplicated, sorted) so
+    equivalent filters compile to the same predicate: equality or ``$in`` on
+    indexed fields, plus a range on the date index.
+    """
+    query = {}
+    
+    for field, values in (('ae', ae), ('region', region), ('stage', stage), ('industry', industry)):
+        values = sorted({value.strip() for value in values or () if value and value.strip()})
+        if len(values) == 1:
+            query[field] = values[0]
+        elif values:
+            query[field] = {'$in': values}
+    query.update(date_range_query(date_from, date_to))
+    return query
+
+def filter_cache_key(query: Dict[str, Any]) -> str:
+    """Canonical form of a compiled deal filter, identical for equivalent filters"""
+    return json.dumps(query, sort_keys=True, default=json_default)
+
+def deals_find_spec(query: Dict[str, Any], sort: str, order: str, fields: Optional[str], after: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, int], List[Tuple[str, int]]]:
+    """Validate the deal listing options into (page query, projection, sort spec)"""
+    if sort not in DEAL_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by '{sort}'")
+    
+    projection = {'_id': 0}
+    if fields:
+        requested = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in requested if field not in DEAL_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        # id and the sort key are always returned since cursors are built from them
+        projection.update({field: 1 for field in {*requested, 'id', sort}})
+    
+    direction = ASCENDING if order == 'asc' else DESCENDING
+    sort_spec = [('id', direction)] if sort == 'id' else [(sort, direction), ('id', direction)]
+    
+    page_query = query
+    if after:
+        value, last_id = decode_deals_cursor(after, sort, order)
+        page_query = {'$and': [query, keyset_filter(sort, order, value, last_id)]}
+    return page_query, projection, sort_spec
+
+async def find_deals_page(page_query, projection, sort_spec, sort: str, order: str, limit: Optional[int]) -> Dict[str, Any]:
+    """One page of deals plus the cursor of the next page, if any"""
+    page_size = min(limit or DEALS_DEFAULT_PAGE_SIZE, DEALS_MAX_PAGE_SIZE)
+    # One extra row tells whether another page follows
+    deals = await db.deals.find(page_query, projection, sort=sort_spec, limit=page_size + 1).to_list(None)
+    has_more = len(deals) > page_size
+    deals = deals[:page_size]
+    
+    return {
+        'deals': deals,
+        'count': len(deals),
+        'next_cursor': encode_deals_cursor(sort, order, deals[-1]) if has_more else None
+    }
+
+@api_router.get("/deals")
+async def get_deals(
+    query: Dict[str, Any] = Depends(deal_filter_query),
+    limit: Optional[int] = Query(None, ge=1),
+    after: Optional[str] = None,
+    sort: str = 'id',
+    order: str = Query('asc', pattern='^(asc|desc)$'),
+    fields: Optional[str] = None,
+    response_format: str = Query('json', alias='format', pattern='^(json|ndjson)$')
 ):
-    """Get deals with optional filters"""
+    """Get deals with optional filters, one keyset-paginated page at a time.
+
+    ``format=ndjson`` streams every matching deal (or up to ``limit``) as
+    newline-delimited JSON instead of returning a page.
+    """
     try:
-        query = {}
+        page_query, projection, sort_spec = deals_find_spec(query, sort, order, fields, after)
         
-        if ae:
-            query['ae'] = ae
-        if region:
-            query['region'] = region
-        if stage:
-            query['stage'] = stage
-        if industry:
-            query['industry'] = industry
+        if response_format == 'ndjson':
+            cursor = db.deals.find(page_query, projection, sort=sort_spec, limit=limit or 0, batch_size=DEALS_STREAM_BATCH_SIZE)
+            return StreamingResponse(stream_deals_ndjson(cursor), media_type='application/x-ndjson')
         
-        deals = await db.deals.find(query, {'_id': 0}).to_list(10000)
-        
-        return {'deals': deals, 'count': len(deals)}
+        page = await find_deals_page(page_query, projection, sort_spec, sort, order, limit)
+        return {**page, 'total': await count_deals(query)}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching deals: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def count_deals(query: Dict[str, Any]) -> int:
+    columns = await current_deal_columns()
+    mask = columns.mask(query) if columns else None
+    if mask is not None:
+        return int(mask.sum())
+    return await db.deals.count_documents(query)
+
+async def load_deal_analytics(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline, AE and regional analytics of the deals matching a filter.
+
+    Computed from this worker's deal columns. Without them, unfiltered
+    requests read the snapshot, and a filter is aggregated in one pass that
+    serves all three sections, cached per normalized filter until the data
+    changes.
+    """
+    columns = await current_deal_columns()
+    mask = columns.mask(query) if columns else None
+    if mask is not None:
+        return columns.deal_analytics(mask)
+
+    if not query:
+        snapshot = await get_analytics_snapshot()
+        if snapshot:
+            return {key: snapshot[key] for key in ('pipeline', 'ae_performance', 'regional_metrics')}
+    
+    version = await get_data_version()
+    key = filter_cache_key(query)
+    analytics = filtered_analytics_cache.get(version, key) if version else None
+    if analytics is None:
+        analytics = await single_flight(f"analytics:{key}", lambda: compute_deal_analytics(query))
+        if version:
+            filtered_analytics_cache.put(version, key, analytics)
+    return analytics
+
 @api_router.get("/analytics/pipeline")
-async def get_pipeline_metrics():
+async def get_pipeline_metrics(query: Dict[str, Any] = Depends(deal_filter_query)):
     """Get pipeline metrics"""
     try:
-        deals = await db.deals.find({}, {'_id': 0}).to_list(10000)
+        return (await load_deal_analytics(query))['pipeline']
         
-        if not deals:
-            return {
-                'total_deals': 0,
-                'total_value': 0,
-                'avg_deal_size': 0,
-                'win_rate': 0,
-                'stages': {}
-            }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating pipeline metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/analytics/ae-performance")
+async def get_ae_performance(query: Dict[str, Any] = Depends(deal_filter_query)):
+    """Get AE performance metrics"""
+    try:
+        return {'ae_performance': (await load_deal_analytics(query))['ae_performance']}
         
-        # Calculate metrics
-        total_deals = len(deals)
-        total_value = sum(deal.get('potential_size', 0) for deal in deals)
-        avg_deal_size = total_value / total_deals if total_deals > 0 else 0
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating AE performance: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/analytics/regional")
+async def get_regional_metrics(query: Dict[str, Any] = Depends(deal_filter_query)):
+    """Get regional breakdown"""
+    try:
+        return {'regional_metrics': (await load_deal_analytics(query))['regional_metrics']}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating regional metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def date_bucket_expr(granularity: str) -> Dict[str, Any]:
+    """Aggregation expression for the trend_bucket of a deal's date"""
+    truncate = {'date': '$date', 'unit': granularity, 'timezone': 'UTC'}
+    if granularity == 'week':
+        truncate['startOfWeek'] = 'monday'
+    return {'$dateTrunc': truncate}
+
+async def aggregate_trend_rows(
+    filters: Dict[str, Any],
+    granularity: str,
+    split_by: Optional[str],
+    bucket_range: Optional[Dict[str, datetime]]
+) -> List[Dict[str, Any]]:
+    """Trend rows aggregated from the deals, for filters the rollups are not keyed by"""
+    match = {**filters, 'date': {'$type': 'date'}}
+    # Narrow the scan on the date index; buckets are still selected by their start below
+    if bucket_range and '$gte' in bucket_range:
+        match['date']['$gte'] = bucket_range['$gte']
+    if bucket_range and ('$lt' in bucket_range or '$lte' in bucket_range):
+        match['date']['$lt'] = bucket_range.get('$lt', bucket_range.get('$lte')) + timedelta(days=31)
+    
+    key_expr = ''
+    if split_by:
+        # Blank values are rolled up as 'Unknown'
+        key_expr = {'$cond': [{'$eq': [{'$ifNull': [f'${split_by}', '']}, '']}, 'Unknown', f'${split_by}']}
+    
+    pipeline = [
+        {'$match': match},
+        {'$group': {
+            '_id': {'bucket': date_bucket_expr(granularity), 'key': key_expr},
+            'deals': {'$sum': 1},
+            'value': {'$sum': DEAL_VALUE_EXPR}
+        }},
+        {'$project': {'_id': 0, 'bucket': '$_id.bucket', 'key': '$_id.key', 'deals': 1, 'value': 1}}
+    ]
+    if bucket_range:
+        pipeline.append({'$match': {'bucket': bucket_range}})
+    pipeline.append({'$sort': {'bucket': 1}})
+    return await db.deals.aggregate(pipeline).to_list(None)
+
+@api_router.get("/analytics/trends")
+async def get_trends(
+    granularity: str = Query('month', pattern='^(day|week|month)$'),
+    split_by: Optional[str] = Query(None, pattern='^(region|ae|stage)$'),
+    query: Dict[str, Any] = Depends(deal_filter_query)
+):
+    """Get deal count and value per day/week/month, optionally one series per region, AE or stage.
+
+    Served from the rollups when the filter is empty or on the split
+    dimension alone; other filters aggregate the matching deals.
+    """
+    try:
+        filters = {field: value for field, value in query.items() if field != 'date'}
+        bucket_range = None
+        if 'date' in query:
+            # Buckets are compared by their start, so widen the lower bound to its bucket
+            bucket_range = dict(query['date'])
+            if '$gte' in bucket_range:
+                bucket_range['$gte'] = trend_bucket(bucket_range['$gte'], granularity)
         
-        # Win rate
-        won_deals = len([d for d in deals if d.get('stage', '').lower() in ['deal won', 'closed won', 'won']])
-        closed_deals = len([d for d in deals if d.get('stage', '').lower() in ['deal won', 'deal lost', 'closed won', 'closed lost', 'won', 'lost']])
-        win_rate = (won_deals / closed_deals * 100) if closed_deals > 0 else 0
+        dimension = next(iter(filters), None)
+        if not filters or (len(filters) == 1 and dimension in TREND_DIMENSIONS and split_by in (None, dimension)):
+            rollup_query = {'granularity': granularity, 'dimension': split_by or 'all'}
+            if filters:
+                rollup_query.update({'dimension': dimension, 'key': filters[dimension]})
+            if bucket_range:
+                rollup_query['bucket'] = bucket_range
+            rows = await db.deal_rollups.find(rollup_query, {'_id': 0}, sort=[('bucket', ASCENDING)]).to_list(None)
+        else:
+            rows = await aggregate_trend_rows(filters, granularity, split_by, bucket_range)
         
-        # Stage breakdown
-        stage_metrics = {}
-        for deal in deals:
-            stage = deal.get('stage', 'Unknown')
-            if stage not in stage_metrics:
-                stage_metrics[stage] = {'count': 0, 'value': 0}
-            stage_metrics[stage]['count'] += 1
-            stage_metrics[stage]['value'] += deal.get('potential_size', 0)
+        # Without a split, rows for several filtered keys add up into one series
+        buckets = {}
+        for row in rows:
+            totals = buckets.setdefault((row['key'] if split_by else '', row['bucket']), [0, 0.0])
+            totals[0] += row['deals']
+            totals[1] += row['value']
+        
+        series = {}
+        for (key, bucket), (deals, value) in sorted(buckets.items(), key=lambda item: item[0][1]):
+            series.setdefault(key, []).append(TrendData(
+                date=bucket.strftime('%Y-%m-%d'),
+                deals=deals,
+                value=round(value, 2)
+            ).model_dump())
         
         return {
-            'total_deals': total_deals,
-            'total_value': round(total_value, 2),
-            'avg_deal_size': round(avg_deal_size, 2),
-            'win_rate': round(win_rate, 2),
-            'stages': stage_metrics
+            'granularity': granularity,
+            'split_by': split_by,
+            'series': [
+                {'key': key if split_by else None, 'points': points}
+                for key, points in sorted(series.items())
+            ]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error calculating pipeline metrics: {e}")
+        logger.error(f"Error fetching trends: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/analytics/ae-performance")
-async def get_ae_performance():
-    """Get AE performance metrics"""
+def pivot_sort_key(row: Dict[str, Any], by: List[str]) -> Tuple:
+    # Strings, then numbers and dates, then missing values, so mixed columns still sort
+    return tuple(
+        (2, '') if row[field] is None else (0, row[field]) if isinstance(row[field], str) else (1, row[field])
+        for field in by
+    )
+
+async def aggregate_pivot_rows(by: List[str], granularity: str, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pivot rows aggregated from the deals, for when no deal columns are loaded"""
+    group_id = {field: date_bucket_expr(granularity) if field == 'date' else f'${field}' for field in by}
+    rows = await db.deals.aggregate([
+        {'$match': query},
+        {'$group': {
+            '_id': group_id,
+            'deals': {'$sum': 1},
+            'value': {'$sum': DEAL_VALUE_EXPR},
+            'won_deals': {'$sum': {'$cond': [WON_DEAL_EXPR, 1, 0]}},
+            'closed_deals': {'$sum': {'$cond': [CLOSED_DEAL_EXPR, 1, 0]}}
+        }}
+    ]).to_list(None)
+
+    pivot_rows = []
+    for row in rows:
+        keys = {field: row['_id'].get(field) for field in by}
+        if isinstance(keys.get('date'), datetime) and keys['date'].tzinfo is None:
+            keys['date'] = keys['date'].replace(tzinfo=timezone.utc)
+        pivot_rows.append(shape_pivot_row(keys, row['deals'], row['value'], row['won_deals'], row['closed_deals']))
+    return pivot_rows
+
+@api_router.get("/analytics/pivot")
+async def get_pivot(
+    by: Optional[List[str]] = Query(None),
+    granularity: str = Query('month', pattern='^(day|week|month)$'),
+    query: Dict[str, Any] = Depends(deal_filter_query)
+):
+    """Deal count, value, average size and win rate grouped by any combination of dimensions.
+
+    ``by`` takes PIVOT_DIMENSIONS, repeated or comma-separated; ``date``
+    groups by the ``granularity`` bucket of the create date. The usual deal
+    filters apply. Answered by rolling up this worker's deal cube.
+    """
+    dimensions = []
+    for value in by or ():
+        for field in value.split(','):
+            field = field.strip()
+            if field and field not in dimensions:
+                dimensions.append(field)
+    unknown = [field for field in dimensions if field not in PIVOT_DIMENSIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot pivot by: {', '.join(unknown)}")
+
+    try:
+        columns = await current_deal_columns()
+        rows = columns.pivot(dimensions, granularity, query) if columns else None
+        if rows is None:
+            rows = await aggregate_pivot_rows(dimensions, granularity, query)
+        rows.sort(key=lambda row: pivot_sort_key(row, dimensions))
+
+        totals = shape_pivot_row(
+            {},
+            sum(row['deals'] for row in rows),
+            sum(row['value'] for row in rows),
+            sum(row['won_deals'] for row in rows),
+            sum(row['closed_deals'] for row in rows)
+        )
+        return {
+            'by': dimensions,
+            'granularity': granularity if 'date' in dimensions else None,
+            'rows': rows,
+            'totals': totals
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing pivot: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/analytics/pipeline-history")
+async def get_pipeline_history(as_of: Optional[str] = None):
+    """Get the pipeline by stage as it stood at ``as_of`` (a bare date means the end of that day)"""
     try:
-        deals = await db.deals.find({}, {'_id': 0}).to_list(10000)
+        as_of_time = parse_date_param(as_of, 'as_of', end_of_range=True)
+        if as_of_time is None:
+            as_of_time = datetime.now(timezone.utc)
+        elif is_bare_date(as_of):
+            as_of_time -= timedelta(microseconds=1)
         
-        ae_metrics = {}
+        deals = await reconstruct_deals_as_of(as_of_time)
         
-        for deal in deals:
-            ae = deal.get('ae', 'Unknown')
-            if not ae:
-                continue
-                
-            if ae not in ae_metrics:
-                ae_metrics[ae] = {
-                    'ae_name': ae,
-                    'total_deals': 0,
-                    'total_value': 0,
-                    'won_deals': 0,
-                    'total_closed': 0
-                }
-            
-            ae_metrics[ae]['total_deals'] += 1
-            ae_metrics[ae]['total_value'] += deal.get('potential_size', 0)
-            
-            stage = deal.get('stage', '').lower()
-            if stage in ['deal won', 'closed won', 'won']:
-                ae_metrics[ae]['won_deals'] += 1
-                ae_metrics[ae]['total_closed'] += 1
-            elif stage in ['deal lost', 'closed lost', 'lost']:
-                ae_metrics[ae]['total_closed'] += 1
-        
-        # Calculate derived metrics
-        for ae in ae_metrics:
-            metrics = ae_metrics[ae]
-            metrics['avg_deal_size'] = round(
-                metrics['total_value'] / metrics['total_deals'] if metrics['total_deals'] > 0 else 0,
-                2
-            )
-            metrics['conversion_rate'] = round(
-                metrics['won_deals'] / metrics['total_closed'] * 100 if metrics['total_closed'] > 0 else 0,
-                2
-            )
-            metrics['total_value'] = round(metrics['total_value'], 2)
+        stages = {}
+        won_deals = 0
+        won_value = 0.0
+        for deal in deals.values():
+            stage = deal.get('stage') or 'Unknown'
+            value = deal.get('potential_size') or 0
+            bucket = stages.setdefault(stage, {'count': 0, 'value': 0.0})
+            bucket['count'] += 1
+            bucket['value'] += value
+            if stage.lower() in WON_STAGES:
+                won_deals += 1
+                won_value += value
         
-        return {'ae_performance': list(ae_metrics.values())}
+        return {
+            'as_of': as_of_time.isoformat(),
+            'total_deals': len(deals),
+            'total_pipeline_value': round(sum(s['value'] for s in stages.values()), 2),
+            'won_deals': won_deals,
+            'won_value': round(won_value, 2),
+            'stages': {stage: {'count': s['count'], 'value': round(s['value'], 2)} for stage, s in stages.items()}
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error calculating AE performance: {e}")
+        logger.error(f"Error reconstructing pipeline history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/analytics/regional")
-async def get_regional_metrics():
-    """Get regional breakdown"""
+@api_router.get("/analytics/stage-velocity")
+async def get_stage_velocity(date_from: Optional[str] = None, date_to: Optional[str] = None):
+    """Get how long deals stayed in each stage before moving on.
+
+    Stays are measured between the syncs that observed a deal entering and
+    leaving a stage, and count towards the range when the deal left the stage.
+    """
     try:
-        deals = await db.deals.find({}, {'_id': 0}).to_list(10000)
+        exit_range = date_range_query(date_from, date_to).get('date', {})
+        range_start = exit_range.pop('$gte', None)
         
-        region_metrics = {}
-        
-        for deal in deals:
-            region = deal.get('region', 'Unknown')
-            if not region:
-                continue
-                
-            if region not in region_metrics:
-                region_metrics[region] = {
-                    'region': region,
-                    'total_deals': 0,
-                    'total_value': 0
-                }
+        durations: Dict[str, List[float]] = defaultdict(list)
+        current: Dict[str, Tuple[str, datetime]] = {}
+        query = {'$or': [{'changes.stage': {'$exists': True}}, {'op': 'delete'}]}
+        # Events before the range start are still needed to know when a stay began
+        if exit_range:
+            query['at'] = exit_range
+        sort = [('deal_id', ASCENDING), ('at', ASCENDING)]
+        async for event in db.deal_history.find(query, {'_id': 0}, sort=sort):
+            deal_id = event['deal_id']
+            at = event['at'] if event['at'].tzinfo else event['at'].replace(tzinfo=timezone.utc)
+            entered = current.pop(deal_id, None)
             
-            region_metrics[region]['total_deals'] += 1
-            region_metrics[region]['total_value'] += deal.get('potential_size', 0)
-        
-        # Calculate avg deal size
-        for region in region_metrics:
-            metrics = region_metrics[region]
-            metrics['avg_deal_size'] = round(
-                metrics['total_value'] / metrics['total_deals'] if metrics['total_deals'] > 0 else 0,
-                2
-            )
-            metrics['total_value'] = round(metrics['total_value'], 2)
+            if entered and event['op'] == 'update' and (range_start is None or at >= range_start):
+                stage, since = entered
+                durations[stage or 'Unknown'].append((at - since).total_seconds() / 86400)
+            if event['op'] != 'delete':
+                current[deal_id] = (event['changes']['stage'], at)
         
-        return {'regional_metrics': list(region_metrics.values())}
+        velocity = []
+        for stage, days in sorted(durations.items()):
+            velocity.append({
+                'stage': stage,
+                'transitions': len(days),
+                'avg_days': round(statistics.mean(days), 2),
+                'median_days': round(statistics.median(days), 2)
+            })
         
+        return {'stage_velocity': velocity}
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error calculating regional metrics: {e}")
+        logger.error(f"Error calculating stage velocity: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def load_filter_options() -> Dict[str, List[str]]:
+    columns = await current_deal_columns()
+    if columns:
+        return columns.filter_options()
+
+    snapshot = await get_analytics_snapshot()
+    if snapshot:
+        return snapshot['filters']
+    
+    return await compute_filter_options()
+
 @api_router.get("/analytics/filters")
 async def get_filter_options():
     """Get available filter options"""
     try:
-        deals = await db.deals.find({}, {'_id': 0}).to_list(10000)
+        return await load_filter_options()
         
-        aes = sorted(list(set(deal.get('ae', '') for deal in deals if deal.get('ae'))))
-        regions = sorted(list(set(deal.get('region', '') for deal in deals if deal.get('region'))))
-        stages = sorted(list(set(deal.get('stage', '') for deal in deals if deal.get('stage'))))
-        industries = sorted(list(set(deal.get('industry', '') for deal in deals if deal.get('industry'))))
+    except Exception as e:
+        logger.error(f"Error fetching filter options: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/indexes")
+async def get_index_usage():
+    """Report the managed indexes and how often each has been used"""
+    try:
+        report = {}
+        for collection_name in MANAGED_INDEXES:
+            stats = await db[collection_name].aggregate([{'$indexStats': {}}]).to_list(None)
+            report[collection_name] = sorted(
+                [
+                    {
+                        'name': stat['name'],
+                        'key': dict(stat['key']),
+                        'ops': stat.get('accesses', {}).get('ops', 0),
+                        'since': stat.get('accesses', {}).get('since')
+                    }
+                    for stat in stats
+                ],
+                key=lambda stat: stat['name']
+            )
         
-        return {
-            'aes': aes,
-            'regions': regions,
-            'stages': stages,
-            'industries': industries
-        }
+        return {'indexes': report}
         
     except Exception as e:
-        logger.error(f"Error fetching filter options: {e}")
+        logger.error(f"Error fetching index usage: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def load_sync_status() -> Dict[str, Any]:
+    sync = await db.sync_metadata.find_one({}, {'_id': 0}, sort=[('last_sync', -1)])
+    
+    if not sync:
+        return {
+            'status': 'never_synced',
+            'last_sync': None,
+            'records_synced': 0
+        }
+    
+    return sync
+
 @api_router.get("/sync-status")
 async def get_sync_status():
     """Get last sync status"""
     try:
-        sync = await db.sync_metadata.find_one({}, {'_id': 0}, sort=[('last_sync', -1)])
-        
-        if not sync:
-            return {
-                'status': 'never_synced',
-                'last_sync': None,
-                'records_synced': 0
-            }
-        
-        return sync
+        return await load_sync_status()
         
     except Exception as e:
         logger.error(f"Error fetching sync status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def sync_event(sync_meta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Describe a sync outcome to clients: the data it produced and the sections to refetch"""
+    sync_meta = sync_meta or {}
+    return {
+        'status': sync_meta.get('status', 'never_synced'),
+        'last_sync': sync_meta.get('last_sync'),
+        'records_synced': sync_meta.get('records_synced', 0),
+        'version': data_version(sync_meta),
+        # Records written before sections were tracked invalidate everything
+        'changed': sync_meta.get('changed_sections', list(DASHBOARD_SECTIONS)),
+        'error': sync_meta.get('error')
+    }
+
+class EventBroadcaster:
+    """Fan events out to the /events streams connected to this worker"""
+
+    def __init__(self):
+        self.subscribers = set()
+        # Newest sync announced; a relayed read racing a local sync must not announce an older one
+        self.last_sync: Optional[str] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        for queue in self.subscribers:
+            # A stalled client misses its oldest events rather than holding up the rest
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait((event, data))
+
+    def publish_sync(self, sync_meta: Dict[str, Any]):
+        """Announce a sync outcome, once, unless a newer one was announced already"""
+        last_sync = sync_meta.get('last_sync')
+        if not last_sync or (self.last_sync and last_sync <= self.last_sync):
+            return
+        self.last_sync = last_sync
+        self.publish('snapshot', sync_event(sync_meta))
+
+events = EventBroadcaster()
+
+async def relay_sync_events():
+    """Announce syncs finished by other workers to the streams connected here"""
+    while True:
+        await asyncio.sleep(EVENTS_POLL_SECONDS)
+        if not events.subscribers:
+            continue
+        try:
+            sync_meta = await db.sync_metadata.find_one({}, {'_id': 0})
+            if sync_meta:
+                events.publish_sync(sync_meta)
+        except Exception as e:
+            logger.warning("Could not check for finished syncs: %s", e)
+
+def format_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=json_default)}\n\n"
+
+@api_router.get("/events")
+async def stream_events():
+    """Server-sent events replacing client polling.
+
+    ``hello`` describes the current data on connect, then ``snapshot`` follows
+    every finished sync with the dashboard sections it changed. Streams end
+    after EVENTS_STREAM_SECONDS and EventSource reconnects on its own; its
+    ``hello`` lets the client catch up on anything missed in between.
+    """
+    queue = events.subscribe()
+
+    async def stream():
+        try:
+            sync_meta = await db.sync_metadata.find_one({}, {'_id': 0})
+            # Reconnect quickly once a stream ends
+            yield "retry: 3000\n"
+            yield format_event('hello', {**sync_event(sync_meta), 'scheduler': SYNC_INTERVAL_SECONDS > 0})
+
+            deadline = time.monotonic() + EVENTS_STREAM_SECONDS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), min(remaining, EVENTS_KEEPALIVE_SECONDS))
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event, data)
+        finally:
+            events.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+async def load_mql_sql_metrics() -> Dict[str, Any]:
+    data = await db.mql_sql_metrics.find_one({}, {'_id': 0})
+    
+    if not data:
+        return {
+            'mql_us': {},
+            'mql_india': {},
+            'sql_us': {},
+            'sql_india': {},
+            'mql_total': {},
+            'sql_total': {}
+        }
+    
+    return data.get('data', {})
+
 @api_router.get("/analytics/mql-sql")
 async def get_mql_sql_metrics():
     """Get MQL and SQL metrics"""
     try:
-        data = await db.mql_sql_metrics.find_one({}, {'_id': 0})
-        
-        if not data:
-            return {
-                'mql_us': {},
-                'mql_india': {},
-                'sql_us': {},
-                'sql_india': {},
-                'mql_total': {},
-                'sql_total': {}
-            }
-        
-        return data.get('data', {})
+        return await load_mql_sql_metrics()
         
     except Exception as e:
         logger.error(f"Error fetching MQL/SQL metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def load_lead_funnel(query: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """MQL -> SQL -> deal conversion per region, counting the deals matching ``query``"""
+    # Get MQL/SQL data
+    mql_sql_doc = await db.mql_sql_metrics.find_one({}, {'_id': 0})
+    
+    if not mql_sql_doc:
+        return {
+            'mql_india': 0,
+            'sql_india': 0,
+            'deals_india': 0,
+            'mql_us': 0,
+            'sql_us': 0,
+            'deals_us': 0,
+            'conversion_mql_to_sql_india': 0,
+            'conversion_sql_to_deal_india': 0,
+            'conversion_mql_to_sql_us': 0,
+            'conversion_sql_to_deal_us': 0
+        }
+    
+    mql_sql_data = mql_sql_doc.get('data', {})
+    
+    # Calculate totals for each region
+    mql_india_total = sum(mql_sql_data.get('mql_india', {}).get('totals', []))
+    sql_india_total = sum(mql_sql_data.get('sql_india', {}).get('totals', []))
+    mql_us_total = sum(mql_sql_data.get('mql_us', {}).get('totals', []))
+    sql_us_total = sum(mql_sql_data.get('sql_us', {}).get('totals', []))
+    
+    # Get deal counts by region
+    columns = await current_deal_columns()
+    mask = columns.mask(query or {}) if columns else None
+    snapshot = None if query or mask is not None else await get_analytics_snapshot()
+    if mask is not None:
+        region_counts = columns.region_deal_counts(mask)
+    elif snapshot:
+        region_counts = snapshot['region_deal_counts']
+    else:
+        region_counts = await compute_region_deal_counts(query)
+    deals_india = region_counts.get('india', 0)
+    deals_us = region_counts.get('us', 0)
+    
+    # Calculate conversion rates
+    conv_mql_sql_india = (sql_india_total / mql_india_total * 100) if mql_india_total > 0 else 0
+    conv_sql_deal_india = (deals_india / sql_india_total * 100) if sql_india_total > 0 else 0
+    conv_mql_sql_us = (sql_us_total / mql_us_total * 100) if mql_us_total > 0 else 0
+    conv_sql_deal_us = (deals_us / sql_us_total * 100) if sql_us_total > 0 else 0
+    
+    return {
+        'mql_india': mql_india_total,
+        'sql_india': sql_india_total,
+        'deals_india': deals_india,
+        'mql_us': mql_us_total,
+        'sql_us': sql_us_total,
+        'deals_us': deals_us,
+        'conversion_mql_to_sql_india': round(conv_mql_sql_india, 1),
+        'conversion_sql_to_deal_india': round(conv_sql_deal_india, 1),
+        'conversion_mql_to_sql_us': round(conv_mql_sql_us, 1),
+        'conversion_sql_to_deal_us': round(conv_sql_deal_us, 1),
+        'overall_conversion_india': round((deals_india / mql_india_total * 100) if mql_india_total > 0 else 0, 1),
+        'overall_conversion_us': round((deals_us / mql_us_total * 100) if mql_us_total > 0 else 0, 1)
+    }
+
 @api_router.get("/analytics/lead-funnel")
-async def get_lead_funnel():
+async def get_lead_funnel(query: Dict[str, Any] = Depends(deal_filter_query)):
     """Get lead funnel conversion metrics"""
     try:
-        # Get MQL/SQL data
-        mql_sql_doc = await db.mql_sql_metrics.find_one({}, {'_id': 0})
+        return await load_lead_funnel(query)
         
-        if not mql_sql_doc:
-            return {
-                'mql_india': 0,
-                'sql_india': 0,
-                'deals_india': 0,
-                'mql_us': 0,
-                'sql_us': 0,
-                'deals_us': 0,
-                'conversion_mql_to_sql_india': 0,
-                'conversion_sql_to_deal_india': 0,
-                'conversion_mql_to_sql_us': 0,
-                'conversion_sql_to_deal_us': 0
-            }
+    except Exception as e:
+        logger.error(f"Error calculating lead funnel: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/dashboard")
+async def get_dashboard(
+    sections: Optional[str] = None,
+    query: Dict[str, Any] = Depends(deal_filter_query),
+    limit: Optional[int] = Query(None, ge=1),
+    sort: str = 'id',
+    order: str = Query('asc', pattern='^(asc|desc)$'),
+    fields: Optional[str] = None
+):
+    """Get everything a dashboard page renders in one response.
+
+    ``sections`` picks from DASHBOARD_SECTIONS (the main dashboard's by
+    default); each has the payload of its standalone endpoint, with the deal
+    filters applied as they are there. ``deals`` is the first page.
+    """
+    try:
+        requested = [section.strip() for section in sections.split(',') if section.strip()] if sections else list(DASHBOARD_DEFAULT_SECTIONS)
+        unknown = [section for section in requested if section not in DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
         
-        mql_sql_data = mql_sql_doc.get('data', {})
+        page_query, projection, sort_spec = deals_find_spec(query, sort, order, fields, None)
         
-        # Calculate totals for each region
-        mql_india_total = sum(mql_sql_data.get('mql_india', {}).get('totals', []))
-        sql_india_total = sum(mql_sql_data.get('sql_india', {}).get('totals', []))
-        mql_us_total = sum(mql_sql_data.get('mql_us', {}).get('totals', []))
-        sql_us_total = sum(mql_sql_data.get('sql_us', {}).get('totals', []))
+        loaders = {}
+        # The deals section takes its total from the pipeline aggregation
+        if {'pipeline', 'ae_performance', 'regional_metrics', 'deals'} & set(requested):
+            loaders['analytics'] = load_deal_analytics(query)
+        if 'deals' in requested:
+            loaders['deals'] = find_deals_page(page_query, projection, sort_spec, sort, order, limit)
+        if 'sync_status' in requested:
+            loaders['sync_status'] = load_sync_status()
+        if 'filters' in requested:
+            loaders['filters'] = load_filter_options()
+        if 'lead_funnel' in requested:
+            loaders['lead_funnel'] = load_lead_funnel(query)
+        if 'mql_sql' in requested:
+            loaders['mql_sql'] = load_mql_sql_metrics()
         
-        # Get deal counts by region
-        deals = await db.deals.find({}, {'_id': 0}).to_list(10000)
-        deals_india = len([d for d in deals if d.get('region', '').lower() == 'india'])
-        deals_us = len([d for d in deals if d.get('region', '').lower() == 'us'])
+        results = dict(zip(loaders, await asyncio.gather(*loaders.values())))
+        analytics = results.pop('analytics', {})
+        if 'deals' in results:
+            results['deals']['total'] = analytics['pipeline']['total_deals']
         
-        # Calculate conversion rates
-        conv_mql_sql_india = (sql_india_total / mql_india_total * 100) if mql_india_total > 0 else 0
-        conv_sql_deal_india = (deals_india / sql_india_total * 100) if sql_india_total > 0 else 0
-        conv_mql_sql_us = (sql_us_total / mql_us_total * 100) if mql_us_total > 0 else 0
-        conv_sql_deal_us = (deals_us / sql_us_total * 100) if sql_us_total > 0 else 0
-        
-        return {
-            'mql_india': mql_india_total,
-            'sql_india': sql_india_total,
-            'deals_india': deals_india,
-            'mql_us': mql_us_total,
-            'sql_us': sql_us_total,
-            'deals_us': deals_us,
-            'conversion_mql_to_sql_india': round(conv_mql_sql_india, 1),
-            'conversion_sql_to_deal_india': round(conv_sql_deal_india, 1),
-            'conversion_mql_to_sql_us': round(conv_mql_sql_us, 1),
-            'conversion_sql_to_deal_us': round(conv_sql_deal_us, 1),
-            'overall_conversion_india': round((deals_india / mql_india_total * 100) if mql_india_total > 0 else 0, 1),
-            'overall_conversion_us': round((deals_us / mql_us_total * 100) if mql_us_total > 0 else 0, 1)
-        }
+        return {section: analytics[section] if section in analytics else results[section] for section in requested}
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error calculating lead funnel: {e}")
+        logger.error(f"Error building dashboard: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/trends/ai-news")
@@ -884,6 +3530,156 @@ async def get_ai_trends():
 async def root():
     return {"message": "Lead Pipeline Dashboard API"}
 
+# In-process response cache for GET analytics endpoints
+CACHEABLE_PATH_PREFIXES = ('/api/analytics/', '/api/deals', '/api/dashboard')
+
+class AnalyticsResponseCache:
+    """Bounded LRU cache of responses (or computed results), valid for a single data version"""
+
+    def __init__(self, max_entries: int, name: str = 'analytics_response'):
+        self.max_entries = max_entries
+        self.name = name
+        self.version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, version: str, key: str) -> Optional[Dict[str, Any]]:
+        # A new data version invalidates everything cached so far
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache=self.name, result='miss')
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        CACHE_REQUESTS.inc(cache=self.name, result='hit')
+        return entry
+
+    def put(self, version: str, key: str, entry: Dict[str, Any]):
+        # Drop responses computed against a version that has since been replaced
+        if version != self.version:
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.version = None
+
+analytics_cache = AnalyticsResponseCache(int(os.environ.get('ANALYTICS_CACHE_SIZE', '256')))
+# Computed analytics per normalized deal filter, shared by every endpoint and query string using it
+filtered_analytics_cache = AnalyticsResponseCache(int(os.environ.get('ANALYTICS_CACHE_SIZE', '256')), name='filtered_analytics')
+
+def data_version(sync_meta: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Identify the data a sync_metadata record describes, or None if it holds no synced data"""
+    if not sync_meta or not sync_meta.get('content_hash'):
+        return None
+
+    # last_sync is included so a manual resync of unchanged deals still refreshes
+    # the MQL/SQL data, which is not covered by the Raw Data content hash
+    return compute_content_hash(f"{sync_meta['content_hash']}:{sync_meta.get('last_sync')}")
+
+async def get_data_version() -> Optional[str]:
+    """Identify the currently synced data, or None if nothing has been synced"""
+    return data_version(await db.sync_metadata.find_one({}, {'_id': 0, 'content_hash': 1, 'last_sync': 1}))
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in [tag[2:] if tag.startswith('W/') else tag for tag in candidates]
+
+@app.middleware("http")
+async def analytics_cache_middleware(request: Request, call_next):
+    """Serve analytics GETs from the cache and answer revalidations with 304"""
+    if request.method != 'GET' or not request.url.path.startswith(CACHEABLE_PATH_PREFIXES):
+        return await call_next(request)
+
+    version = await get_data_version()
+    if version is None:
+        return await call_next(request)
+
+    etag = f'"{version}"'
+    # no-cache lets browsers store the response but revalidate it on every fetch
+    cache_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    key = f"{request.url.path}?{'&'.join(sorted(f'{k}={v}' for k, v in request.query_params.multi_items()))}"
+    entry = analytics_cache.get(version, key)
+    if entry is None:
+        response = await call_next(request)
+        # Streamed NDJSON exports are passed through rather than buffered into the cache
+        if response.status_code != 200 or response.headers.get('content-type', '').startswith('application/x-ndjson'):
+            return response
+
+        body = b''.join([chunk async for chunk in response.body_iterator])
+        entry = {'body': body, 'media_type': response.headers.get('content-type')}
+        analytics_cache.put(version, key, entry)
+
+    return Response(content=entry['body'], media_type=entry['media_type'], headers=cache_headers)
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the route serving a request, also for responses that never reached the router"""
+    route = scope.get('route')
+    if route is not None:
+        return route.path
+    # Cached responses and 304s are answered by middleware before routing
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return 'unmatched'
+
+# Registered after the cache middleware so it wraps it and also times cached responses
+@app.middleware("http")
+async def request_metrics_middleware(request: Request, call_next):
+    """Record per-route request latency (for streamed responses, the time to the first byte)"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # The route template keeps label values bounded; unrouted paths share one label
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route_template(request.scope),
+            status=status
+        )
+
+def refresh_cache_hit_ratios():
+    """Derive each cache's hit ratio from its lookup counters"""
+    lookups = {
+        cache: (CACHE_REQUESTS.value(cache=cache, result='hit'), CACHE_REQUESTS.value(cache=cache, result='miss'))
+        for cache in ('analytics_response', 'filtered_analytics', 'analytics_snapshot', 'change_check')
+    }
+    date_cache = parse_sheet_date.cache_info()
+    lookups['parse_sheet_date'] = (date_cache.hits, date_cache.misses)
+
+    for cache, (hits, misses) in lookups.items():
+        if hits + misses:
+            CACHE_HIT_RATIO.set(round(hits / (hits + misses), 4), cache=cache)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Expose performance metrics in the Prometheus text format"""
+    refresh_cache_hit_ratios()
+    return Response(content=metrics.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -895,6 +3691,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def provision_indexes():
+    """Create and reconcile the indexes declared in MANAGED_INDEXES"""
+    for collection_name, models in MANAGED_INDEXES.items():
+        try:
+            await reconcile_indexes(db[collection_name], models)
+        except Exception as e:
+            logger.error(f"Error provisioning indexes for {collection_name}: {e}")
+
+@app.on_event("startup")
+async def open_http_session():
+    get_http_session()
+
+sync_scheduler_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_sync_scheduler():
+    global sync_scheduler_task
+    if SYNC_INTERVAL_SECONDS > 0:
+        sync_scheduler_task = asyncio.create_task(sync_scheduler())
+
+relay_sync_events_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_event_relay():
+    global relay_sync_events_task
+    # Syncs that finished before this worker started are not news to its clients
+    sync_meta = await db.sync_metadata.find_one({}, {'_id': 0, 'last_sync': 1})
+    events.last_sync = sync_meta and sync_meta.get('last_sync')
+    relay_sync_events_task = asyncio.create_task(relay_sync_events())
+
+@app.on_event("shutdown")
+async def stop_event_relay():
+    if relay_sync_events_task is not None:
+        relay_sync_events_task.cancel()
+        await asyncio.gather(relay_sync_events_task, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def stop_sync_scheduler():
+    if sync_scheduler_task is not None:
+        sync_scheduler_task.cancel()
+        await asyncio.gather(sync_scheduler_task, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def stop_sync_jobs():
+    # Interrupted jobs record themselves as cancelled while the database is still reachable
+    tasks = [job.task for job in sync_jobs.values() if job.task is not None and not job.task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def close_parse_pool():
+    if parse_executor is not None:
+        parse_executor.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("shutdown")
+async def close_http_session():
+    if http_session is not None:
+        await http_session.close()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""Raw Data parser benchmark: row-by-row parser vs the columnar block parser.
+
+Generates a synthetic HubSpot export, parses it with both engines, checks
+that they produce identical deals and reports the time each one took.
+
+    python benchmarks/bench_parser.py --rows 500000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# server.py connects lazily, but reads its settings at import time
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'lead_pipeline_bench')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server  # noqa: E402
+from synthetic import raw_data_rows  # noqa: E402
+
+
+def parse_raw_data_row(row, header_idx, seen_keys):
+    """Reference row-by-row parser the block parser must match: one Raw Data row into a deal, or None if skipped"""
+    if not row or len(row) == 0:
+        return None
+
+    deal_data = {}
+
+    # Extract fields using column mapping
+    for col_name, field_name in server.RAW_DATA_COLUMN_MAP.items():
+        idx = header_idx.get(col_name)
+        if idx is not None and idx < len(row):
+            value = row[idx].strip() if isinstance(row[idx], str) and row[idx] else ""
+
+            # Parse numeric fields
+            if field_name in ['amount', 'potential_size']:
+                try:
+                    cleaned = str(value).replace('$', '').replace(',', '').replace('₹', '').replace('"', '').strip()
+                    deal_data[field_name] = float(cleaned) if cleaned else 0.0
+                except ValueError:
+                    deal_data[field_name] = 0.0
+            else:
+                deal_data[field_name] = value
+
+    # Use amount as potential_size if not separately available
+    if 'potential_size' not in deal_data or deal_data.get('potential_size', 0) == 0:
+        deal_data['potential_size'] = deal_data.get('amount', 0.0)
+
+    # Skip rows without deal name or stage
+    if not deal_data.get('deal_name') or not deal_data.get('stage'):
+        return None
+
+    # Skip rejected/archived deals if needed (optional - keeping all for now)
+    stage = deal_data.get('stage', '').lower()
+    if stage == 'reject':
+        return None  # Skip rejected deals
+
+    # Stable id so re-syncs can diff against stored deals; duplicate keys
+    # (same name and create date, no HubSpot ID) get an occurrence suffix
+    deal_key = server.compute_deal_key(deal_data)
+    seen_keys[deal_key] = seen_keys.get(deal_key, 0) + 1
+    if seen_keys[deal_key] > 1:
+        deal_key = f"{deal_key}-{seen_keys[deal_key]}"
+
+    # Set defaults for missing fields
+    if not deal_data.get('ae'):
+        deal_data['ae'] = 'Unknown'
+    if not deal_data.get('region'):
+        deal_data['region'] = 'Unknown'
+    if not deal_data.get('industry'):
+        deal_data['industry'] = 'Unknown'
+    if not deal_data.get('confidence'):
+        deal_data['confidence'] = 'Medium'
+    # Dates are stored as real datetimes so range filters can use the date index
+    if deal_data.get('date'):
+        deal_data['date'] = server.parse_sheet_date(deal_data['date'])
+    else:
+        deal_data['date'] = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if 'close_date' in deal_data:
+        deal_data['close_date'] = server.parse_sheet_date(deal_data['close_date'])
+
+    deal_data['id'] = deal_key
+    deal_data['row_hash'] = server.compute_row_hash(deal_data)
+    deal_data['created_at'] = datetime.now(timezone.utc).isoformat()
+    return deal_data
+
+
+def comparable(deals):
+    # created_at is a wall-clock timestamp, not parsed content
+    return [{k: v for k, v in deal.items() if k != 'created_at'} for deal in deals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--block', type=int, default=server.DEAL_WRITE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    rows = raw_data_rows(args.rows)
+    header_idx = server.build_header_index(rows[0])
+
+    # Both engines start with a cold date cache
+    server.parse_sheet_date.cache_clear()
+    started = time.perf_counter()
+    seen_keys = {}
+    row_deals = []
+    for row in rows[1:]:
+        deal = parse_raw_data_row(row, header_idx, seen_keys)
+        if deal:
+            row_deals.append(deal)
+    row_seconds = time.perf_counter() - started
+
+    server.parse_sheet_date.cache_clear()
+    started = time.perf_counter()
+    seen_keys = {}
+    block_deals = []
+    for start in range(1, len(rows), args.block):
+        block_deals.extend(server.parse_raw_data_rows(rows[start:start + args.block], header_idx, seen_keys))
+    block_seconds = time.perf_counter() - started
+
+    if comparable(row_deals) != comparable(block_deals):
+        mismatch = next(
+            i for i, (a, b) in enumerate(zip(comparable(row_deals), comparable(block_deals))) if a != b
+        ) if len(row_deals) == len(block_deals) else 'count'
+        print(f"PARITY FAILED at deal {mismatch} ({len(row_deals)} vs {len(block_deals)} deals)")
+        sys.exit(1)
+
+    print(f"rows: {args.rows}, deals: {len(row_deals)}, parity: ok")
+    print(f"row parser:      {row_seconds:8.3f}s  {args.rows / row_seconds:12,.0f} rows/s")
+    print(f"columnar parser: {block_seconds:8.3f}s  {args.rows / block_seconds:12,.0f} rows/s")
+    print(f"speedup:         {row_seconds / block_seconds:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""Benchmark suite for the sync and analytics hot paths.
+
+For every dataset size it generates synthetic Raw Data and MQL/SQL exports,
+serves them from a local HTTP stub standing in for Google Sheets, and measures:
+
+- parse_raw_data and parse_mql_sql_data
+- sync_sheets end to end (initial blue/green load, then an unchanged re-sync)
+- every GET /api/analytics/* endpoint and /api/deals over real HTTP, both
+  with a cold response cache and a warm one
+
+Before timing the endpoints it checks that the sync stored every parsed deal
+and that the in-memory deal columns and pivot agree with the MongoDB
+aggregations, and every request must return 200; any mismatch fails the run.
+
+Each size runs in its own process so peak RSS belongs to that size. Results
+(throughput, p50/p99 latency, peak RSS) are written to benchmarks/results/
+tagged with the commit, and can be compared against an earlier run:
+
+    python benchmarks/run.py
+    python benchmarks/run.py --sizes 1000,100000,1000000 --mongo-url mongodb://localhost:27017
+    python benchmarks/run.py --compare latest
+
+Without --mongo-url the app runs against mongomock-motor, an in-process Mongo
+stand-in (pip install -r benchmarks/requirements.txt). Its timings are only
+comparable with other mongomock runs, and it is slow, so the default sizes are
+small there (DEFAULT_SIZES lists both).
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / 'results'
+BENCH_DB_NAME = 'lead_pipeline_bench'
+DEFAULT_SIZES = {'mongod': '1000,100000', 'mongomock': '200,500'}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples, items=1, unit='rows'):
+    """p50/p99 in milliseconds plus throughput in ``unit`` per second"""
+    return {
+        'samples': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'throughput': round(items * len(samples) / sum(samples), 1) if sum(samples) else None,
+        'unit': f"{unit}/s",
+    }
+
+
+async def check_parity(server, expected_deals):
+    """Names of the results that disagree with the MongoDB aggregations"""
+    from synthetic import comparable
+
+    failures = []
+    if await server.db.deals.count_documents({}) != expected_deals:
+        failures.append('stored deal count')
+
+    columns = await server.current_deal_columns()
+    if columns is None:
+        return failures + ['deal columns not loaded']
+    if columns.size != expected_deals:
+        failures.append('deal column count')
+    if comparable(columns.deal_analytics(columns.mask({}))) != comparable(await server.compute_deal_analytics()):
+        failures.append('deal analytics')
+    if columns.filter_options() != await server.compute_filter_options():
+        failures.append('filter options')
+    for by in (['stage'], ['ae', 'region'], ['industry', 'lead_source', 'confidence']):
+        if comparable(columns.pivot(by, 'month', {})) != comparable(await server.aggregate_pivot_rows(by, 'month', {})):
+            failures.append(f"pivot by {','.join(by)}")
+    return failures
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+async def bench_size(size, args):
+    """Run every benchmark for one dataset size inside this process"""
+    os.environ.setdefault('MONGO_URL', args.mongo_url or 'mongodb://localhost:27017')
+    os.environ['DB_NAME'] = BENCH_DB_NAME
+    # Syncs are driven by the benchmark, not the background scheduler
+    os.environ['SYNC_INTERVAL_SECONDS'] = '0'
+    sys.path.insert(0, str(BENCH_DIR.parent / 'backend'))
+
+    import logging
+    import aiohttp
+    import uvicorn
+    import server
+    from synthetic import raw_data_rows, mql_sql_rows, start_sheet_stub, to_csv
+
+    logging.getLogger().setLevel(args.log_level)
+    logging.getLogger('server').setLevel(args.log_level)
+
+    if args.mongo_url:
+        await server.client.drop_database(BENCH_DB_NAME)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        server.client = AsyncMongoMockClient()
+        server.db = server.client[BENCH_DB_NAME]
+
+    metrics = {}
+    failures = []
+    raw_rows = raw_data_rows(size)
+    mql_rows = mql_sql_rows(size)
+    raw_csv = to_csv(raw_rows).encode('utf-8')
+    mql_csv = to_csv(mql_rows).encode('utf-8')
+
+    samples = []
+    for _ in range(args.repeat):
+        server.parse_sheet_date.cache_clear()
+        started = time.perf_counter()
+        expected_deals = len(server.parse_raw_data(raw_rows))
+        samples.append(time.perf_counter() - started)
+    metrics['parse_raw_data'] = summarize(samples, size)
+
+    samples = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        server.parse_mql_sql_data(mql_rows)
+        samples.append(time.perf_counter() - started)
+    metrics['parse_mql_sql_data'] = summarize(samples, len(mql_rows))
+    del raw_rows, mql_rows
+
+    # Local stand-in for the Google Sheets CSV export
+    stub_runner, stub_url = await start_sheet_stub({'raw': raw_csv, 'mql': mql_csv})
+    server.RAW_DATA_CSV_URL = f"{stub_url}/raw"
+    server.SHEET_2_CSV_URL = f"{stub_url}/mql"
+
+    api = uvicorn.Server(uvicorn.Config(server.app, host='127.0.0.1', port=0, log_level='warning', lifespan='on'))
+    api_task = asyncio.create_task(api.serve())
+    while not api.started:
+        await asyncio.sleep(0.01)
+    api_url = f"http://127.0.0.1:{api.servers[0].sockets[0].getsockname()[1]}"
+
+    try:
+        started = time.perf_counter()
+        result = await server.sync_sheets(full=True, wait=True)
+        metrics['sync_sheets_initial'] = summarize([time.perf_counter() - started], size)
+        if result['records_synced'] != expected_deals:
+            failures.append('records synced')
+        failures += await check_parity(server, expected_deals)
+
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            await server.sync_sheets(wait=True)
+            samples.append(time.perf_counter() - started)
+        metrics['sync_sheets_unchanged'] = summarize(samples, size)
+
+        paths = sorted(
+            route.path for route in server.app.routes
+            if route.path.startswith('/api/analytics/') and 'GET' in getattr(route, 'methods', ())
+        ) + ['/api/deals', '/api/dashboard']
+
+        async with aiohttp.ClientSession(api_url) as session:
+            for path in paths:
+                for cache in ('cold', 'warm'):
+                    samples = []
+                    for _ in range(args.requests):
+                        if cache == 'cold':
+                            server.analytics_cache.clear()
+                        started = time.perf_counter()
+                        async with session.get(path) as response:
+                            await response.read()
+                            status = response.status
+                        samples.append(time.perf_counter() - started)
+                        if status != 200:
+                            failures.append(f"GET {path} returned {status}")
+                            break
+                    result = summarize(samples, unit='requests')
+                    result['status'] = status
+                    metrics[f"GET {path} ({cache})"] = result
+    finally:
+        # Drop before shutdown, which closes the Mongo client
+        if args.mongo_url:
+            await server.client.drop_database(BENCH_DB_NAME)
+        api.should_exit = True
+        await api_task
+        await stub_runner.cleanup()
+
+    if failures:
+        raise SystemExit(f"Results differ at {size} rows: {'; '.join(failures)}")
+    return {'size': size, 'metrics': metrics, 'peak_rss_mb': peak_rss_mb()}
+
+
+def git_revision():
+    def git(*cmd):
+        return subprocess.run(['git', *cmd], cwd=BENCH_DIR, capture_output=True, text=True).stdout.strip()
+    return git('rev-parse', '--short', 'HEAD') or 'unknown', bool(git('status', '--porcelain', '--untracked-files=no'))
+
+
+def load_results(name):
+    if name == 'latest':
+        runs = sorted(RESULTS_DIR.glob('*.json'))
+        if not runs:
+            sys.exit('No stored benchmark results to compare against')
+        return json.loads(runs[-1].read_text())
+    return json.loads(Path(name).read_text())
+
+
+def print_run(run, baseline=None):
+    base = {}
+    for entry in (baseline or {}).get('runs', []):
+        for name, result in entry['metrics'].items():
+            base[(entry['size'], name)] = result
+
+    for entry in run['runs']:
+        print(f"\n== {entry['size']:,} rows (peak RSS {entry['peak_rss_mb']} MB)")
+        for name, result in entry['metrics'].items():
+            line = f"{name:<48} p50 {result['p50_ms']:>10.2f} ms  p99 {result['p99_ms']:>10.2f} ms"
+            if result['throughput'] is not None:
+                line += f"  {result['throughput']:>12,.1f} {result['unit']}"
+            previous = base.get((entry['size'], name))
+            if previous and previous['p50_ms']:
+                line += f"  ({(result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100:+.1f}% p50)"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', help='comma-separated Raw Data row counts (default: DEFAULT_SIZES)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per parse/sync benchmark')
+    parser.add_argument('--requests', type=int, default=50, help='requests per endpoint and cache state')
+    parser.add_argument('--mongo-url', help='benchmark against this mongod instead of mongomock-motor')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--compare', help="stored result file to compare against, or 'latest'")
+    parser.add_argument('--no-save', action='store_true', help='do not store the results')
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(asyncio.run(bench_size(args.child, args))))
+        return
+
+    baseline = load_results(args.compare) if args.compare else None
+    if args.compare and args.sizes == '':
+        print_run(baseline)
+        return
+    mongo = 'mongod' if args.mongo_url else 'mongomock'
+    sizes = args.sizes or DEFAULT_SIZES[mongo]
+
+    commit, dirty = git_revision()
+    run = {
+        'commit': commit,
+        'dirty': dirty,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'mongo': mongo,
+        'runs': [],
+    }
+    for size in (int(size) for size in sizes.split(',') if size):
+        child = [sys.executable, __file__, '--child', str(size), '--repeat', str(args.repeat),
+                 '--requests', str(args.requests), '--log-level', args.log_level]
+        if args.mongo_url:
+            child += ['--mongo-url', args.mongo_url]
+        output = subprocess.run(child, capture_output=True, text=True)
+        if output.returncode != 0:
+            sys.stderr.write(output.stderr)
+            sys.exit(f"Benchmark for {size} rows failed")
+        run['runs'].append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print_run(run, baseline)
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        path = RESULTS_DIR / f"{stamp}-{commit}{'-dirty' if dirty else ''}.json"
+        path.write_text(json.dumps(run, indent=2))
+        print(f"\nSaved results to {path.relative_to(BENCH_DIR.parent)}")
+
+
+if __name__ == '__main__':
+    main()
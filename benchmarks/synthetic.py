@@ -0,0 +1,110 @@
+"""Synthetic Google Sheets exports shaped like the Raw Data and MQL/SQL tabs, plus the
+helpers the benchmarks and tests share to serve them and compare results"""
+import csv
+import io
+import random
+from typing import Any, Dict, List, Tuple
+
+RAW_DATA_HEADERS = [
+    'Record ID', 'dealname', 'dealstage_name', 'Deal owner', 'geography', 'Industry',
+    'Amount', 'Confidence', 'Create Date', 'Close Date', 'Acquisition Channel', 'Notes',
+]
+STAGES = ['Deal Won', 'Deal Lost', 'Proposal', 'SQL', 'Contract', 'Negotiation', 'Reject', '']
+OWNERS = ['Asha Rao', 'Ben Ortiz', 'Chen Wei', 'Dana Fox', '']
+REGIONS = ['US', 'India', 'EMEA', 'APAC', '']
+INDUSTRIES = ['BFSI', 'Retail', 'Healthcare', 'SaaS', '']
+AMOUNT_FORMATS = ['${:,}', '₹{:,}', '{}', '"{:,}"', ' {} ']
+CHANNELS = ['Organic', 'Paid Search', 'Paid Social', 'Events', 'Referral', 'Partner', 'Outbound', 'Webinar']
+MQL_SQL_SECTIONS = ['MQL - US', 'MQL - India', 'SQL - US', 'SQL - India']
+
+
+def raw_data_rows(count: int, seed: int = 7) -> List[List[str]]:
+    """Header plus ``count`` HubSpot export rows, including the awkward cases the parser handles:
+    blank and junk amounts, missing record IDs, duplicate names, rejected deals and short rows"""
+    rng = random.Random(seed)
+    rows = [list(RAW_DATA_HEADERS)]
+    for i in range(count):
+        if rng.random() > 0.05:
+            amount = rng.choice(AMOUNT_FORMATS).format(rng.randint(0, 250000))
+        else:
+            amount = rng.choice(['', 'n/a', 'TBD'])
+        if rng.random() > 0.02:
+            created = f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.choice([2023, 2024, 2025])}"
+        else:
+            created = ''
+        row = [
+            str(100000 + i) if rng.random() > 0.1 else '',
+            f"Deal {i % (count // 2 or 1)}" if rng.random() > 0.01 else '',
+            rng.choice(STAGES),
+            rng.choice(OWNERS),
+            rng.choice(REGIONS),
+            rng.choice(INDUSTRIES),
+            amount,
+            rng.choice(['High', 'Medium', 'Low', '']),
+            created,
+            rng.choice(['', '2025-03-31', '12/31/2024 17:30']),
+            rng.choice(['Inbound', 'Outbound', 'Partner', '']),
+            'free text',
+        ]
+        if rng.random() < 0.01:
+            row = row[:rng.randint(0, 8)]
+        rows.append(row)
+    return rows
+
+
+def mql_sql_rows(count: int, seed: int = 7) -> List[List[str]]:
+    """About ``count`` rows of the MQL/SQL tab: four sections of weekly channel counts with totals"""
+    rng = random.Random(seed)
+    weeks = ['Jan 6', 'Jan 13', 'Jan 20', 'Jan 27', 'Feb 3', 'Weekly Target']
+    per_section = max(1, count // len(MQL_SQL_SECTIONS) - 3)
+
+    rows = []
+    for section in MQL_SQL_SECTIONS:
+        rows.append(['', '', '', '', '', '', section, ''])
+        rows.append(['', 'Acquistion Channel', *weeks])
+        totals = [0] * 6
+        for i in range(per_section):
+            values = [rng.randint(0, 40) for _ in range(6)]
+            totals = [t + v for t, v in zip(totals, values)]
+            channel = CHANNELS[i % len(CHANNELS)] + ('' if i < len(CHANNELS) else f" {i // len(CHANNELS)}")
+            rows.append(['', channel, *map(str, values)])
+        rows.append(['', 'Total', *map(str, totals)])
+    return rows
+
+
+def to_csv(rows: List[List[str]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def start_sheet_stub(sheets: Dict[str, bytes]) -> Tuple[Any, str]:
+    """Serve ``sheets[name]`` at /<name> as a local stand-in for the Google Sheets CSV export.
+
+    The dict is read on every request, so callers can swap a sheet's content
+    between syncs. Returns the aiohttp runner (for cleanup) and the base URL.
+    """
+    from aiohttp import web
+
+    async def handler(request):
+        return web.Response(body=sheets[request.match_info['name']], content_type='text/csv')
+
+    stub = web.Application()
+    stub.router.add_get('/{name}', handler)
+    runner = web.AppRunner(stub, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def comparable(value: Any) -> Any:
+    """Round floats and order rows so results from different paths compare equal"""
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {key: comparable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [comparable(item) for item in value]
+        return sorted(items, key=repr) if items and isinstance(items[0], dict) else items
+    return value
@@ -1,8 +1,11 @@
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
+import { Button } from "@/components/ui/button";
+
+const DealTable = ({ deals, total, hasMore = false, loadingMore = false, onLoadMore }) => {
+  const totalDeals = total ?? deals.length;
 
-const DealTable = ({ deals }) => {
   const formatCurrency = (value) => {
     return new Intl.NumberFormat('en-US', {
       style: 'currency',
@@ -42,7 +45,7 @@ const DealTable = ({ deals }) => {
       <CardHeader>
         <CardTitle>All Deals</CardTitle>
         <CardDescription>
-          Showing {deals.length} deal{deals.length !== 1 ? 's' : ''}
+          Showing {deals.length}{totalDeals > deals.length ? ` of ${totalDeals}` : ''} deal{totalDeals !== 1 ? 's' : ''}
         </CardDescription>
       </CardHeader>
       <CardContent>
@@ -92,6 +95,13 @@ const DealTable = ({ deals }) => {
             </TableBody>
           </Table>
         </div>
+        {hasMore && onLoadMore && (
+          <div className="mt-4 flex justify-center">
+            <Button variant="outline" size="sm" onClick={onLoadMore} disabled={loadingMore} data-testid="load-more-deals">
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </Button>
+          </div>
+        )}
       </CardContent>
     </Card>
   );
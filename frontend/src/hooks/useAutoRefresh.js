@@ -1,12 +1,17 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import axios from 'axios';
+import { runSyncJob } from '../lib/syncJob';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8001';
 
 /**
- * Hook for automatic data refresh when Google Sheet changes
- * @param {Function} onDataChanged - Callback when data has been synced
- * @param {number} intervalMs - Polling interval in milliseconds (default: 30000)
+ * Hook for automatic data refresh when Google Sheet changes.
+ * The backend pushes a `snapshot` event over /api/events whenever a sync finishes, naming the
+ * dashboard sections that changed. Polling /api/sheets/auto-sync is only used when the backend
+ * scheduler is disabled (dashboards then drive syncs), while the event stream is down, or when the
+ * browser lacks EventSource.
+ * @param {Function} onDataChanged - Callback when data has been synced; receives `changed` sections when known
+ * @param {number} intervalMs - Polling interval in milliseconds when polling (default: 30000)
  * @param {boolean} enabled - Whether auto-refresh is enabled (default: true)
  */
 export function useAutoRefresh(onDataChanged, intervalMs = 30000, enabled = true) {
@@ -15,7 +20,11 @@ export function useAutoRefresh(onDataChanged, intervalMs = 30000, enabled = true
   const [lastCheck, setLastCheck] = useState(null);
   const [error, setError] = useState(null);
   const [syncCount, setSyncCount] = useState(0);
+  const [polling, setPolling] = useState(typeof EventSource === 'undefined');
   const intervalRef = useRef(null);
+  const lastSyncRef = useRef(null);
+  const onDataChangedRef = useRef(onDataChanged);
+  onDataChangedRef.current = onDataChanged;
 
   const checkAndSync = useCallback(async () => {
     if (isChecking) return;
@@ -24,11 +33,18 @@ export function useAutoRefresh(onDataChanged, intervalMs = 30000, enabled = true
     setError(null);
 
     try {
-      const response = await axios.post(`${API_BASE_URL}/api/sheets/auto-sync`);
+      // The backend syncs on its own schedule; `since` lets it report syncs we haven't seen
+      const response = await axios.post(`${API_BASE_URL}/api/sheets/auto-sync`, null, {
+        params: lastSyncRef.current ? { since: lastSyncRef.current } : {},
+      });
       const data = response.data;
 
       setLastCheck(new Date().toISOString());
 
+      if (data.last_sync) {
+        lastSyncRef.current = data.last_sync;
+      }
+
       if (data.synced) {
         setLastSync(data.last_sync);
         setSyncCount(data.records_synced);
@@ -61,9 +77,9 @@ export function useAutoRefresh(onDataChanged, intervalMs = 30000, enabled = true
       setIsChecking(true);
       setError(null);
 
-      const response = await axios.post(`${API_BASE_URL}/api/sheets/sync`);
-      const data = response.data;
+      const data = await runSyncJob(`${API_BASE_URL}/api`);
 
+      lastSyncRef.current = data.last_sync;
       setLastSync(data.last_sync);
       setSyncCount(data.records_synced);
 
@@ -81,9 +97,51 @@ export function useAutoRefresh(onDataChanged, intervalMs = 30000, enabled = true
     }
   }, [onDataChanged]);
 
+  // Listen for finished syncs
+  useEffect(() => {
+    if (!enabled || typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(`${API_BASE_URL}/api/events`);
+
+    // A sync we have not seen yet; `hello` after a reconnect reports one missed in between
+    const handleSync = (data, isHello) => {
+      setLastCheck(new Date().toISOString());
+      setError(data.status === 'error' ? data.error : null);
+      if (!data.last_sync) return;
+
+      const seen = lastSyncRef.current;
+      lastSyncRef.current = data.last_sync;
+      setLastSync(data.last_sync);
+      setSyncCount(data.records_synced);
+
+      if (data.status === 'success' && seen !== data.last_sync && (seen || !isHello) && onDataChangedRef.current) {
+        onDataChangedRef.current({
+          synced: true,
+          reason: 'changes_detected',
+          records_synced: data.records_synced,
+          last_sync: data.last_sync,
+          // Several syncs may have been missed while reconnecting, so refetch everything
+          changed: isHello ? undefined : data.changed,
+        });
+      }
+    };
+
+    source.addEventListener('hello', (event) => {
+      const data = JSON.parse(event.data);
+      // Without the backend scheduler nothing syncs unless dashboards ask, so keep polling
+      setPolling(!data.scheduler);
+      handleSync(data, true);
+    });
+    source.addEventListener('snapshot', (event) => handleSync(JSON.parse(event.data), false));
+    // Poll while the stream is down; the browser keeps reconnecting and `hello` stops polling again
+    source.addEventListener('error', () => setPolling(true));
+
+    return () => source.close();
+  }, [enabled]);
+
   // Set up polling interval
   useEffect(() => {
-    if (!enabled) {
+    if (!enabled || !polling) {
       if (intervalRef.current) {
         clearInterval(intervalRef.current);
         intervalRef.current = null;
@@ -103,7 +161,7 @@ export function useAutoRefresh(onDataChanged, intervalMs = 30000, enabled = true
         intervalRef.current = null;
       }
     };
-  }, [enabled, intervalMs, checkAndSync]);
+  }, [enabled, polling, intervalMs, checkAndSync]);
 
   return {
     isChecking,
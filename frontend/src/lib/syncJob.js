@@ -0,0 +1,30 @@
+import axios from "axios";
+
+const TERMINAL_STATUSES = ["succeeded", "failed", "cancelled"];
+
+/**
+ * Start a sheet sync and wait for its job to finish.
+ * Resolves with the sync result; rejects with an Error carrying the job's error.
+ * @param {string} api - Base URL of the API, e.g. `${BACKEND_URL}/api`
+ * @param {Object} options
+ * @param {Function} options.onProgress - Called with the job document on every poll
+ * @param {number} options.pollMs - Delay between job polls in milliseconds (default: 1000)
+ */
+export async function runSyncJob(api, { onProgress, pollMs = 1000 } = {}) {
+  let { data: job } = await axios.post(`${api}/sheets/sync`);
+
+  while (!TERMINAL_STATUSES.includes(job.status)) {
+    if (onProgress) {
+      onProgress(job);
+    }
+    await new Promise((resolve) => setTimeout(resolve, pollMs));
+    ({ data: job } = await axios.get(`${api}/sheets/jobs/${job.id}`));
+  }
+
+  if (job.status !== "succeeded") {
+    throw new Error(job.error || `Sync ${job.status}`);
+  }
+  return job.result;
+}
+
+export default runSyncJob;
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from "react";
+import { useState, useEffect, useCallback, useRef } from "react";
 import axios from "axios";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
@@ -11,9 +11,15 @@ import AEPerformance from "../components/AEPerformance";
 import RegionalBreakdown from "../components/RegionalBreakdown";
 import DealTable from "../components/DealTable";
 import { useAutoRefresh } from "../hooks/useAutoRefresh";
+import { runSyncJob } from "../lib/syncJob";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+const DEALS_PAGE_SIZE = 100;
+// Dashboard sections that depend on the deal filters
+const FILTERED_SECTIONS = "pipeline,ae_performance,regional_metrics,deals";
+// Every section this page renders
+const PAGE_SECTIONS = ["sync_status", "pipeline", "ae_performance", "regional_metrics", "deals", "filters"];
 
 const Dashboard = () => {
   const [loading, setLoading] = useState(false);
@@ -23,6 +29,9 @@ const Dashboard = () => {
   const [aePerformance, setAePerformance] = useState([]);
   const [regionalMetrics, setRegionalMetrics] = useState([]);
   const [deals, setDeals] = useState([]);
+  const [dealsTotal, setDealsTotal] = useState(0);
+  const [dealsCursor, setDealsCursor] = useState(null);
+  const [loadingMoreDeals, setLoadingMoreDeals] = useState(false);
   const [autoRefreshEnabled, setAutoRefreshEnabled] = useState(true);
   const [filters, setFilters] = useState({
     ae: null,
@@ -30,6 +39,9 @@ const Dashboard = () => {
     stage: null,
     industry: null
   });
+  // Read by dealParams, so refetches from memoised callbacks use the filters shown now
+  const filtersRef = useRef(filters);
+  filtersRef.current = filters;
   const [filterOptions, setFilterOptions] = useState({
     aes: [],
     regions: [],
@@ -37,15 +49,20 @@ const Dashboard = () => {
     industries: []
   });
 
-  // Callback when data changes via auto-refresh
+  // Callback when data changes via auto-refresh: refetch only the sections the sync changed
   const handleDataChanged = useCallback((syncResult) => {
     if (syncResult.synced) {
-      toast.success(`Auto-synced ${syncResult.records_synced} records`);
-      fetchData();
+      const sections = syncResult.changed
+        ? PAGE_SECTIONS.filter((section) => syncResult.changed.includes(section))
+        : PAGE_SECTIONS;
+      if (sections.length > 1) {
+        toast.success(`Auto-synced ${syncResult.records_synced} records`);
+      }
+      fetchSections(sections);
     }
   }, []);
 
-  // Auto-refresh hook - polls every 30 seconds
+  // Auto-refresh hook - notified by the backend when a sync finishes
   const { isChecking, lastSync: autoLastSync, lastCheck, error: autoError } = useAutoRefresh(
     handleDataChanged,
     30000,
@@ -58,21 +75,29 @@ const Dashboard = () => {
 
   useEffect(() => {
     if (syncStatus?.status === 'success') {
-      fetchDeals();
+      fetchFilteredSections();
     }
   }, [filters]);
 
+  // One /dashboard request returns every section the page renders
+  const applyDashboard = (data) => {
+    if (data.sync_status) setSyncStatus(data.sync_status);
+    if (data.pipeline) setPipelineMetrics(data.pipeline);
+    if (data.ae_performance) setAePerformance(data.ae_performance);
+    if (data.regional_metrics) setRegionalMetrics(data.regional_metrics);
+    if (data.filters) setFilterOptions(data.filters);
+    if (data.deals) {
+      setDeals(data.deals.deals || []);
+      setDealsTotal(data.deals.total || 0);
+      setDealsCursor(data.deals.next_cursor || null);
+    }
+  };
+
   const fetchData = async () => {
     setLoading(true);
     try {
-      await Promise.all([
-        fetchSyncStatus(),
-        fetchPipelineMetrics(),
-        fetchAEPerformance(),
-        fetchRegionalMetrics(),
-        fetchDeals(),
-        fetchFilterOptions()
-      ]);
+      const response = await axios.get(`${API}/dashboard`, { params: dealParams() });
+      applyDashboard(response.data);
     } catch (error) {
       console.error("Error fetching data:", error);
       toast.error("Failed to load dashboard data");
@@ -81,75 +106,62 @@ const Dashboard = () => {
     }
   };
 
-  const fetchSyncStatus = async () => {
-    try {
-      const response = await axios.get(`${API}/sync-status`);
-      setSyncStatus(response.data);
-    } catch (error) {
-      console.error("Error fetching sync status:", error);
-    }
-  };
-
-  const fetchPipelineMetrics = async () => {
-    try {
-      const response = await axios.get(`${API}/analytics/pipeline`);
-      setPipelineMetrics(response.data);
-    } catch (error) {
-      console.error("Error fetching pipeline metrics:", error);
-    }
-  };
-
-  const fetchAEPerformance = async () => {
+  const fetchSections = async (sections) => {
     try {
-      const response = await axios.get(`${API}/analytics/ae-performance`);
-      setAePerformance(response.data.ae_performance || []);
+      const response = await axios.get(`${API}/dashboard`, {
+        params: { ...dealParams(), sections: sections.join(",") }
+      });
+      applyDashboard(response.data);
     } catch (error) {
-      console.error("Error fetching AE performance:", error);
+      console.error("Error refreshing dashboard:", error);
     }
   };
 
-  const fetchRegionalMetrics = async () => {
+  const fetchFilteredSections = async () => {
     try {
-      const response = await axios.get(`${API}/analytics/regional`);
-      setRegionalMetrics(response.data.regional_metrics || []);
+      const response = await axios.get(`${API}/dashboard`, {
+        params: { ...dealParams(), sections: FILTERED_SECTIONS }
+      });
+      applyDashboard(response.data);
     } catch (error) {
-      console.error("Error fetching regional metrics:", error);
+      console.error("Error fetching filtered dashboard:", error);
     }
   };
 
-  const fetchDeals = async () => {
-    try {
-      const params = {};
-      if (filters.ae) params.ae = filters.ae;
-      if (filters.region) params.region = filters.region;
-      if (filters.stage) params.stage = filters.stage;
-      if (filters.industry) params.industry = filters.industry;
-
-      const response = await axios.get(`${API}/deals`, { params });
-      setDeals(response.data.deals || []);
-    } catch (error) {
-      console.error("Error fetching deals:", error);
-    }
+  const dealParams = () => {
+    const params = { limit: DEALS_PAGE_SIZE };
+    const current = filtersRef.current;
+    if (current.ae) params.ae = current.ae;
+    if (current.region) params.region = current.region;
+    if (current.stage) params.stage = current.stage;
+    if (current.industry) params.industry = current.industry;
+    return params;
   };
 
-  const fetchFilterOptions = async () => {
+  const loadMoreDeals = async () => {
+    if (!dealsCursor) return;
+    setLoadingMoreDeals(true);
     try {
-      const response = await axios.get(`${API}/analytics/filters`);
-      setFilterOptions(response.data);
+      const response = await axios.get(`${API}/deals`, { params: { ...dealParams(), after: dealsCursor } });
+      setDeals((current) => [...current, ...(response.data.deals || [])]);
+      setDealsCursor(response.data.next_cursor || null);
     } catch (error) {
-      console.error("Error fetching filter options:", error);
+      console.error("Error fetching more deals:", error);
+      toast.error("Failed to load more deals");
+    } finally {
+      setLoadingMoreDeals(false);
     }
   };
 
   const handleSync = async () => {
     setSyncing(true);
     try {
-      const response = await axios.post(`${API}/sheets/sync`);
-      toast.success(`Synced ${response.data.records_synced} records successfully`);
+      const result = await runSyncJob(API);
+      toast.success(`Synced ${result.records_synced} records successfully`);
       await fetchData();
     } catch (error) {
       console.error("Error syncing data:", error);
-      toast.error(error.response?.data?.detail || "Failed to sync data. Please ensure the Google Sheet is publicly accessible.");
+      toast.error(error.response?.data?.detail || error.message || "Failed to sync data. Please ensure the Google Sheet is publicly accessible.");
     } finally {
       setSyncing(false);
     }
@@ -316,7 +328,7 @@ const Dashboard = () => {
         <Card className="mb-8" data-testid="filters-card">
           <CardHeader>
             <CardTitle>Filters</CardTitle>
-            <CardDescription>Filter deals by account executive, region, stage, or industry</CardDescription>
+            <CardDescription>Filter deals and pipeline metrics by account executive, region, stage, or industry</CardDescription>
           </CardHeader>
           <CardContent>
             <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
@@ -403,7 +415,13 @@ const Dashboard = () => {
         </div>
 
         {/* Deal Table */}
-        <DealTable deals={deals} />
+        <DealTable
+          deals={deals}
+          total={dealsTotal}
+          hasMore={Boolean(dealsCursor)}
+          loadingMore={loadingMoreDeals}
+          onLoadMore={loadMoreDeals}
+        />
       </div>
     </div>
   );
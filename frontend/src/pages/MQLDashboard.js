@@ -9,9 +9,12 @@ import MQLSQLTable from "../components/MQLSQLTable";
 import TargetGauge from "../components/TargetGauge";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { useAutoRefresh } from "../hooks/useAutoRefresh";
+import { runSyncJob } from "../lib/syncJob";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+// Every section this page renders
+const PAGE_SECTIONS = ["sync_status", "lead_funnel", "mql_sql"];
 
 const MQLDashboard = () => {
   const [loading, setLoading] = useState(false);
@@ -22,15 +25,20 @@ const MQLDashboard = () => {
   const [dateRange, setDateRange] = useState('all');
   const [autoRefreshEnabled, setAutoRefreshEnabled] = useState(true);
 
-  // Callback when data changes via auto-refresh
+  // Callback when data changes via auto-refresh: refetch only the sections the sync changed
   const handleDataChanged = useCallback((syncResult) => {
     if (syncResult.synced) {
-      toast.success(`Auto-synced ${syncResult.records_synced} records`);
-      fetchData();
+      const sections = syncResult.changed
+        ? PAGE_SECTIONS.filter((section) => syncResult.changed.includes(section))
+        : PAGE_SECTIONS;
+      if (sections.length > 1) {
+        toast.success(`Auto-synced ${syncResult.records_synced} records`);
+      }
+      fetchData(sections);
     }
   }, []);
 
-  // Auto-refresh hook - polls every 30 seconds
+  // Auto-refresh hook - notified by the backend when a sync finishes
   const { isChecking, lastSync: autoLastSync } = useAutoRefresh(
     handleDataChanged,
     30000,
@@ -41,14 +49,15 @@ const MQLDashboard = () => {
     fetchData();
   }, []);
 
-  const fetchData = async () => {
+  const fetchData = async (sections = PAGE_SECTIONS) => {
     setLoading(true);
     try {
-      await Promise.all([
-        fetchSyncStatus(),
-        fetchLeadFunnel(),
-        fetchMQLSQL()
-      ]);
+      const response = await axios.get(`${API}/dashboard`, {
+        params: { sections: sections.join(",") }
+      });
+      if (response.data.sync_status) setSyncStatus(response.data.sync_status);
+      if (response.data.lead_funnel) setLeadFunnelData(response.data.lead_funnel);
+      if (response.data.mql_sql) setMqlSqlData(response.data.mql_sql);
     } catch (error) {
       console.error("Error fetching data:", error);
       toast.error("Failed to load MQL/SQL dashboard data");
@@ -57,42 +66,15 @@ const MQLDashboard = () => {
     }
   };
 
-  const fetchSyncStatus = async () => {
-    try {
-      const response = await axios.get(`${API}/sync-status`);
-      setSyncStatus(response.data);
-    } catch (error) {
-      console.error("Error fetching sync status:", error);
-    }
-  };
-
-  const fetchLeadFunnel = async () => {
-    try {
-      const response = await axios.get(`${API}/analytics/lead-funnel`);
-      setLeadFunnelData(response.data);
-    } catch (error) {
-      console.error("Error fetching lead funnel:", error);
-    }
-  };
-
-  const fetchMQLSQL = async () => {
-    try {
-      const response = await axios.get(`${API}/analytics/mql-sql`);
-      setMqlSqlData(response.data);
-    } catch (error) {
-      console.error("Error fetching MQL/SQL data:", error);
-    }
-  };
-
   const handleSync = async () => {
     setSyncing(true);
     try {
-      const response = await axios.post(`${API}/sheets/sync`);
-      toast.success(`Synced ${response.data.records_synced} records successfully`);
+      const result = await runSyncJob(API);
+      toast.success(`Synced ${result.records_synced} records successfully`);
       await fetchData();
     } catch (error) {
       console.error("Error syncing data:", error);
-      toast.error(error.response?.data?.detail || "Failed to sync data");
+      toast.error(error.response?.data?.detail || error.message || "Failed to sync data");
     } finally {
       setSyncing(false);
     }
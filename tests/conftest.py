@@ -0,0 +1,71 @@
+"""Shared fixtures: the backend app on mongomock-motor, fed by a local sheet stub.
+
+Needs the backend requirements plus mongomock-motor
+(pip install -r backend/requirements.txt -r benchmarks/requirements.txt).
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / 'backend'), str(ROOT / 'benchmarks')]
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'lead_pipeline_test')
+os.environ.setdefault('SYNC_INTERVAL_SECONDS', '0')
+os.environ.setdefault('PARSE_POOL', 'thread')
+
+RAW_DATA_ROWS = 300
+MQL_SQL_ROWS = 120
+
+
+@pytest.fixture(scope='session')
+def server():
+    import server
+    from mongomock_motor import AsyncMongoMockClient
+
+    server.client = AsyncMongoMockClient()
+    server.db = server.client[os.environ['DB_NAME']]
+    return server
+
+
+@pytest.fixture(scope='session')
+def raw_data_csv():
+    from synthetic import raw_data_rows, to_csv
+    return to_csv(raw_data_rows(RAW_DATA_ROWS)).encode()
+
+
+@pytest.fixture(scope='session')
+def mql_sql_csv():
+    from synthetic import mql_sql_rows, to_csv
+    return to_csv(mql_sql_rows(MQL_SQL_ROWS)).encode()
+
+
+@pytest.fixture(scope='session')
+def sheets(raw_data_csv, mql_sql_csv):
+    """What the sheet stub serves; tests may swap an export and must put it back"""
+    return {'raw': raw_data_csv, 'mql': mql_sql_csv}
+
+
+@pytest.fixture(scope='session')
+def client(server, sheets):
+    """A TestClient whose sheet URLs point at an aiohttp stub serving the synthetic exports"""
+    from fastapi.testclient import TestClient
+    from synthetic import start_sheet_stub
+
+    with TestClient(server.app) as test_client:
+        runner, url = test_client.portal.call(start_sheet_stub, sheets)
+        server.RAW_DATA_CSV_URL = f"{url}/raw"
+        server.SHEET_2_CSV_URL = f"{url}/mql"
+        yield test_client
+        test_client.portal.call(runner.cleanup)
+
+
+@pytest.fixture(scope='session')
+def synced(client):
+    """Run one blocking full sync and return its result"""
+    response = client.post('/api/sheets/sync', params={'full': True, 'wait': True})
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+
+import pytest
+
+
+@pytest.mark.parametrize('value', ['2024-01-05', '1/5/2024', '01/05/2024', '05-Jan-2024', 'Jan 05, 2024'])
+def test_bare_end_date_covers_the_whole_day(server, value):
+    assert server.date_range_query(value, value) == {'date': {
+        '$gte': datetime(2024, 1, 5, tzinfo=timezone.utc),
+        '$lt': datetime(2024, 1, 6, tzinfo=timezone.utc)
+    }}
+
+
+@pytest.mark.parametrize('value', ['2024-01-05T10:30:00', '2024-01-05 10:30', '1/5/2024 10:30', '1/5/2024 10:30 AM'])
+def test_end_instant_is_inclusive(server, value):
+    assert server.date_range_query(None, value) == {'date': {'$lte': datetime(2024, 1, 5, 10, 30, tzinfo=timezone.utc)}}
@@ -0,0 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_process_pool_falls_back_to_threads(server, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError(38, 'Function not implemented')
+
+    monkeypatch.setattr(server, 'PARSE_POOL', 'process')
+    monkeypatch.setattr(server, 'PARSE_WORKERS', 2)
+    monkeypatch.setattr(server, 'ProcessPoolExecutor', unavailable)
+    monkeypatch.setattr(server, 'parse_executor', None)
+
+    executor = server.get_parse_executor()
+    try:
+        assert isinstance(executor, ThreadPoolExecutor)
+    finally:
+        executor.shutdown()
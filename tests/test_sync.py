@@ -0,0 +1,191 @@
+import asyncio
+import csv
+import io
+
+import pytest
+
+
+def test_facet_groups_do_not_share_branches(server):
+    with pytest.raises(ValueError):
+        server.combine_facets(server.PIPELINE_FACETS, {'stages': []})
+    assert set(server.ANALYTICS_SNAPSHOT_FACETS) >= set(server.FILTER_OPTION_FACETS) | set(server.PIPELINE_FACETS)
+
+
+def test_sync_stores_content_hash(client, synced):
+    status = client.get('/api/sync-status').json()
+    assert status['status'] == 'success'
+    assert status['records_synced'] == synced['records_synced']
+
+
+def test_snapshot_matches_live_aggregation(client, server, synced):
+    snapshot = client.portal.call(server.get_analytics_snapshot)
+    assert snapshot is not None
+    assert snapshot['pipeline'] == client.portal.call(server.compute_deal_analytics)['pipeline']
+    assert snapshot['filters'] == client.portal.call(server.compute_filter_options)
+    assert snapshot['filters']['stages']
+
+
+def test_dashboard_after_sync(client, synced):
+    response = client.get('/api/dashboard', params={'sections': 'pipeline,filters,deals', 'limit': 5})
+    assert response.status_code == 200, response.text
+    dashboard = response.json()
+    assert dashboard['pipeline']['total_deals'] == synced['records_synced']
+    assert dashboard['deals']['total'] == synced['records_synced']
+    assert set(dashboard['filters']) == {'aes', 'regions', 'stages', 'industries'}
+
+
+def test_every_endpoint_after_sync(client, server, synced):
+    paths = sorted(
+        route.path for route in server.app.routes
+        if 'GET' in getattr(route, 'methods', ())
+        and route.path.startswith('/api/') and '{' not in route.path
+        # An event stream never ends, and mongomock has no $indexStats
+        and route.path not in ('/api/events', '/api/indexes')
+    )
+    assert '/api/analytics/pivot' in paths
+    for path in paths:
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.text)
+        # A second request may be answered from the response cache
+        assert client.get(path).status_code == 200, path
+
+
+def stored_rollups(rows):
+    return sorted(
+        # MongoDB hands dates back naive
+        ((row['granularity'], row['bucket'].replace(tzinfo=None), row['dimension'], row['key']), row['deals'], round(row['value'], 6))
+        for row in rows
+    )
+
+
+def test_cancelled_sync_keeps_rollups_in_step(client, server, synced, monkeypatch):
+    written = None
+
+    async def stream_then_hang(writer, prefetched):
+        deals = await server.db.deals.find({}, {'_id': 0}).to_list(50)
+        for deal in deals:
+            deal['potential_size'] = (deal.get('potential_size') or 0) + 1000
+            deal['row_hash'] = server.compute_row_hash(deal)
+        await writer.write(deals)
+        written.set()
+        await asyncio.Event().wait()
+
+    async def cancel_mid_sync():
+        nonlocal written
+        written = asyncio.Event()
+        task = asyncio.create_task(server.sync_deals(False, None))
+        await asyncio.wait([task, asyncio.ensure_future(written.wait())], return_when=asyncio.FIRST_COMPLETED)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        expected = server.RollupDeltas()
+        async for deal in server.db.deals.find({}, {'_id': 0}):
+            expected.add(deal)
+        return expected.documents(), await server.db.deal_rollups.find({}, {'_id': 0}).to_list(None)
+
+    monkeypatch.setattr(server, 'stream_raw_data', stream_then_hang)
+    expected, rollups = client.portal.call(cancel_mid_sync)
+    monkeypatch.undo()
+    assert stored_rollups(rollups) == stored_rollups(expected)
+
+    # Put the synced sheet back for the other tests
+    response = client.post('/api/sheets/sync', params={'full': True, 'wait': True})
+    assert response.status_code == 200, response.text
+
+
+def test_cached_responses_keep_their_route_label(client, server, synced):
+    def requests(status):
+        state = server.REQUEST_SECONDS.value(method='GET', route='/api/analytics/pipeline', status=status)
+        return state[-1] if state else 0
+
+    before = requests(200), requests(304)
+    etag = client.get('/api/analytics/pipeline').headers['etag']
+    client.get('/api/analytics/pipeline')
+    assert client.get('/api/analytics/pipeline', headers={'If-None-Match': etag}).status_code == 304
+    assert (requests(200), requests(304)) == (before[0] + 2, before[1] + 1)
+
+
+def test_snapshot_is_not_served_after_a_failed_sync(client, server, synced):
+    async def snapshot_after_failure():
+        current = await server.db.sync_metadata.find_one({}, {'_id': 0})
+        served = await server.get_analytics_snapshot()
+        await server.record_failed_sync('cancelled', 'Sync cancelled')
+        try:
+            return served, await server.get_analytics_snapshot()
+        finally:
+            await server.db.sync_metadata.delete_many({})
+            await server.db.sync_metadata.insert_one(current)
+
+    served, after_failure = client.portal.call(snapshot_after_failure)
+    assert served is not None and served['content_hash'] == synced['content_hash']
+    assert after_failure is None
+
+
+def test_auto_sync_streams_the_spooled_change_check_download(client, server, raw_data_csv, synced):
+    def raw_data_bytes(purpose):
+        return server.SHEET_DOWNLOAD_BYTES.value(sheet='raw_data', purpose=purpose)
+
+    client.portal.call(server.record_failed_sync, 'error', 'Forced resync')
+    server._last_change_check.clear()
+    before = raw_data_bytes('change_check'), raw_data_bytes('sync')
+
+    result = client.portal.call(server.auto_sync)
+
+    assert result['synced'] is True, result
+    # The sync replayed the body the check spooled rather than downloading it again
+    assert raw_data_bytes('change_check') == before[0] + len(raw_data_csv)
+    assert raw_data_bytes('sync') == before[1]
+    assert server._last_change_check['download'] is None
+    assert client.get('/api/sync-status').json()['status'] == 'success'
+
+
+def test_sync_stops_when_its_lease_is_taken_over(client, server, monkeypatch):
+    monkeypatch.setattr(server, 'SYNC_LEASE_SECONDS', 0.3)
+
+    async def hold_lease_while_taken_over():
+        async with server.exclusive_sync():
+            lease = server.current_sync_lease.get()
+            await server.db.sync_leases.update_one(
+                {'_id': server.SYNC_LEASE_ID},
+                {'$set': {'owner': 'another-worker', 'expires_at': server.datetime.now(server.timezone.utc) + server.timedelta(minutes=5)}}
+            )
+            await asyncio.sleep(0.25)
+            with pytest.raises(server.SyncCancelled, match='lease lost'):
+                server.SyncProgress().check_cancelled()
+            return lease.lost
+
+    assert client.portal.call(hold_lease_while_taken_over) is True
+    client.portal.call(server.db.sync_leases.delete_many, {})
+
+
+def test_incremental_sync_drops_cells_emptied_in_the_sheet(client, server, sheets, synced):
+    from synthetic import to_csv
+
+    original = sheets['raw']
+    rows = list(csv.reader(io.StringIO(original.decode())))
+    expected = {deal['id']: deal for deal in server.parse_raw_data(rows)}
+    edited_row = next(i for i, row in enumerate(rows[1:], 1) if server.parse_raw_data([rows[0], row]) and row[9] and row[10])
+    # A shortened row loses its Close Date and Acquisition Channel cells
+    rows[edited_row] = rows[edited_row][:9]
+    edited = {deal['id']: deal for deal in server.parse_raw_data(rows)}
+    changed = [deal_id for deal_id in edited if edited[deal_id]['row_hash'] != expected[deal_id]['row_hash']]
+    assert len(changed) == 1 and 'close_date' not in edited[changed[0]]
+
+    sheets['raw'] = to_csv(rows).encode()
+    try:
+        response = client.post('/api/sheets/sync', params={'wait': True})
+        assert response.status_code == 200, response.text
+        assert response.json()['changes']['updated'] == 1
+        assert response.json()['changes']['full_resync'] is False
+
+        stored = client.portal.call(server.db.deals.find_one, {'id': changed[0]}, {'_id': 0, 'created_at': 0})
+        # MongoDB hands dates back naive
+        assert stored == {
+            key: value.replace(tzinfo=None) if hasattr(value, 'tzinfo') else value
+            for key, value in edited[changed[0]].items() if key != 'created_at'
+        }
+    finally:
+        sheets['raw'] = original
+        response = client.post('/api/sheets/sync', params={'full': True, 'wait': True})
+        assert response.status_code == 200, response.text